@@ -143,17 +143,14 @@ r3 = create_ring(
 r3.set_spline_surface(s_fs, "top")
 
 ####################
-# Grading
+# Grading (connected blocks, e.g. r1 and r3, adopt it automatically)
 c2.set_grading_axial(grading_top)
-r3.set_grading_axial(grading_top)
 r2.set_grading_radial(grading_top)
 
 c1.set_grading_axial(grading_bottom)
-r1.set_grading_axial(grading_bottom)
 r2.set_grading_axial(grading_bottom)
 
 r1.set_grading_radial(grading_meniscus)
-r3.set_grading_radial(grading_meniscus)
 
 c1.set_grading_radial(grading_crys_rad)
 c2.set_grading_radial(grading_crys_rad)
@@ -188,6 +185,7 @@ res_z_c3, grading_crys = boundary_layer(
     layer_thickness_crystal_bottom,
     growth_rate_crystal_bottom,
 )
+# the melt / crystal interface is copied exactly from the melt mesh
 c3 = create_cylinder(
     mesh,
     [r_crystal, s_cr(r_crystal)],
@@ -195,9 +193,9 @@ c3 = create_cylinder(
     res_r_c1,
     res_phi,
     res_z_c3,
+    cylinder_below=c2.transfer(mesh, "top"),
 )
 c3.set_spline_surface(s_cr, "top")
-c3.set_spline_surface(s_ph, "bottom")
 c3.set_grading_axial(grading_crys)
 c3.set_grading_radial(grading_crys_rad)
 
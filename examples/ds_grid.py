@@ -12,7 +12,9 @@ grad_d_xmin = f"( ({grad_d_layer_size} {grad_d_n_cells} {grad_d_expansion}) ({co
 grad_d_xmax = f"( ({container_r - grad_d_layer_size} {res_d/2 - grad_d_n_cells} 1) ({grad_d_layer_size} {grad_d_n_cells} {1/grad_d_expansion}))"
 
 melt_h = container_h - h_phase_if_edges
-grad_melt_h = f"( ({grad_melt_bt_size} {grad_melt_bt_cells} {grad_melt_bt_expansion}) ({melt_h - grad_melt_bt_size - grad_melt_top_size} {res_h_melt - grad_melt_bt_cells - grad_melt_top_cells} 1) ({grad_melt_top_size} {grad_melt_top_cells} {1/grad_melt_top_expansion}) )"
+res_h_melt, grad_melt_h = boundary_layers(
+    melt_h, [("xmin", *grad_melt_bt), ("xmax", *grad_melt_top)]
+)
 
 crys_h = container_h - melt_h
 grad_crys_h = f"( ({crys_h - grad_crys_top_size} {res_h_crystal - grad_crys_top_cells} 1) ({grad_crys_top_size} {grad_crys_top_cells} {1/grad_crys_top_expansion}) )"
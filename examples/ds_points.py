@@ -13,7 +13,6 @@ solid and fluid directories were wrong
 # mesh sizes
 res_d = 38
 res_h_crystal = 10
-res_h_melt = 14
 
 # geometry
 
@@ -31,13 +30,9 @@ grad_d_layer_size = 0.012
 grad_d_n_cells = 5
 grad_d_expansion = 4
 
-grad_melt_bt_size = 0.012
-grad_melt_bt_cells = 5
-grad_melt_bt_expansion = 4
-
-grad_melt_top_size = 0.012
-grad_melt_top_cells = 5
-grad_melt_top_expansion = 4
+# boundary layers at bottom and top of melt: (smallest element, layer thickness, growth rate)
+grad_melt_bt = (0.0015, 0.012, 1.4)
+grad_melt_top = (0.0015, 0.012, 1.4)
 
 
 grad_crys_top_size = 0.015
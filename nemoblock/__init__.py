@@ -1,5 +1,6 @@
 # from . import blocks, cylinder
 from .blocks import *
+from .grading import *
 from .cylinder import *
 
 from ._version import get_versions
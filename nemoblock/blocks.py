@@ -1,6 +1,14 @@
 from dataclasses import dataclass
 import numpy as np
 import os
+from collections import deque
+import scipy.spatial as spatial
+import scipy.optimize as optimize
+
+from .grading import Grading, Expansion
+from .quality import Quality, cell_quality, corner_jacobians, _CORNER_NEIGHBORS
+from .quality import _corners
+from .geometry import quad_areas, hex_volumes
 
 
 class Mesh:
@@ -17,6 +25,13 @@ class Mesh:
 
         self.patches = []
 
+        self.cell_size = None
+        self.cell_budget = None
+        self._auto_cells = set()
+        self.refinement = 1
+        # blocks transferred from other meshes, see Block.transfer
+        self._interfaces = []
+
     def _add_point(self, x1, x2, x3):
         p = Point(x1, x2, x3, self.point_count)
         self.point_count += 1
@@ -33,7 +48,782 @@ class Mesh:
         self.block_count += 1
         self.blocks.append(block)
 
-    def write(self, directory="./system"):
+    def get_patch(self, name):
+        """Get the patch with the given name, create it if it doesn't exist.
+
+        Args:
+            name (str): Name of the patch, e.g. "wall crucible".
+
+        Returns:
+            Patch object.
+        """
+        for p in self.patches:
+            if p.name == name:
+                return p
+        return Patch(self, name)
+
+    def _connected_directions(self):
+        """Group the directions of the blocks that are connected by shared
+        edges and thus need the same number of cells.
+
+        Returns:
+            dict: Representative of the group for each (block index, axis).
+        """
+        parent = {}
+
+        def find(key):
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        shared = {}
+        for i, b in enumerate(self.blocks):
+            for axis, edges in enumerate(_AXIS_EDGES):
+                parent[(i, axis)] = (i, axis)
+                for _, start, end in edges:
+                    p_start = getattr(b, start)
+                    p_end = getattr(b, end)
+                    if p_start is p_end:  # collapsed edge
+                        continue
+                    key = frozenset([id(p_start), id(p_end)])
+                    if key in shared:
+                        parent[find((i, axis))] = find(shared[key])
+                    else:
+                        shared[key] = (i, axis)
+        return {key: find(key) for key in parent}
+
+    def _fixed_cells(self, groups):
+        """Numbers of cells per group that were set explicitly or derived
+        from another mesh."""
+        fixed = {}
+        for i, b in enumerate(self.blocks):
+            cells = [b._cells_x1, b._cells_x2, b._cells_x3]
+            for axis in range(3):
+                if cells[axis] != 0 and (id(b), axis) not in self._auto_cells:
+                    fixed.setdefault(groups[(i, axis)], cells[axis])
+        return fixed
+
+    def _edge_lengths(self, default_size=None):
+        """Integral of ds / h along the edges, maximum of the parallel edges
+        per (block index, axis)."""
+        lengths = {}
+        for i, b in enumerate(self.blocks):
+            size = b.cell_size if b.cell_size is not None else self.cell_size
+            if size is None:
+                size = default_size
+            if size is None:
+                continue
+            for axis, edges in enumerate(_AXIS_EDGES):
+                for name, start, end in edges:
+                    if getattr(b, start) is getattr(b, end):
+                        continue
+                    x = getattr(b, name).sample()
+                    h = _evaluate_size(size, (x[1:] + x[:-1]) / 2)
+                    n = (np.linalg.norm(np.diff(x, axis=0), axis=1) / h).sum()
+                    lengths[(i, axis)] = max(lengths.get((i, axis), 0), n)
+        return lengths
+
+    def _required_cells(self, groups, default_size=None):
+        """Integral of ds / h along the edges, maximum per group."""
+        required = {}
+        for key, n in self._edge_lengths(default_size).items():
+            root = groups[key]
+            required[root] = max(required.get(root, 0), n)
+        return required
+
+    def _set_cells(self, groups, cells, fixed):
+        """Set the numbers of cells per group, groups that are not fixed are
+        marked as computed automatically."""
+        for i, b in enumerate(self.blocks):
+            cells_block = [b._cells_x1, b._cells_x2, b._cells_x3]
+            for axis in range(3):
+                root = groups[(i, axis)]
+                if root not in cells:
+                    raise RuntimeError(
+                        f"Number of cells not defined for block {b.id} (no cell size)."
+                    )
+                cells_block[axis] = cells[root]
+                if root not in fixed:
+                    self._auto_cells.add((id(b), axis))
+            b._cells_x1, b._cells_x2, b._cells_x3 = cells_block
+
+    def _resolve_cells(self):
+        """Compute undefined numbers of cells from mesh.cell_budget or the
+        cell sizes."""
+        if any(0 in [b._cells_x1, b._cells_x2, b._cells_x3] for b in self.blocks):
+            if self.cell_budget is not None:
+                self.distribute_cells(self.cell_budget)
+            else:
+                self.compute_number_of_cells()
+
+    def compute_number_of_cells(self, cell_size=None, grading=False):
+        """Compute the number of cells of all blocks from a target cell size.
+        Block directions connected by shared edges get the same number of
+        cells, the finest requirement wins. Numbers of cells that were set
+        explicitly or derived from another mesh are kept.
+
+        Args:
+            cell_size (float or callable, optional): Target cell size or
+                function h(x) of the coordinates x (array of shape (n, 3)).
+                Overrides mesh.cell_size, block.cell_size takes precedence.
+            grading (bool, optional): Set edgeGrading from the ratio of the
+                cell sizes at the ends of each edge. Blocks that are already
+                graded are kept.
+        """
+        if cell_size is not None:
+            self.cell_size = cell_size
+        groups = self._connected_directions()
+        cells = {
+            root: max(1, int(np.ceil(n)))
+            for root, n in self._required_cells(groups).items()
+        }
+        fixed = self._fixed_cells(groups)
+        cells.update(fixed)
+        self._set_cells(groups, cells, fixed)
+        if grading:
+            for b in self.blocks:
+                if not all(b.grading.edge_expansion(k).uniform for k in range(12)):
+                    continue
+                size = b.cell_size if b.cell_size is not None else self.cell_size
+                ratios = []
+                for edges in _AXIS_EDGES:
+                    for _, start, end in edges:
+                        p_start = getattr(b, start)
+                        p_end = getattr(b, end)
+                        x = np.array(
+                            [
+                                [p_start.x1, p_start.x2, p_start.x3],
+                                [p_end.x1, p_end.x2, p_end.x3],
+                            ]
+                        )
+                        h = _evaluate_size(size, x)
+                        ratios.append(float(h[1] / h[0]))
+                b.grading = Grading.edge(*ratios)
+
+    def propagate_grading(self):
+        """Propagate the grading through connected blocks. Edges shared by
+        several blocks must have the same grading. Uniformly graded edges
+        adopt the grading of the connected edges and of the parallel edges
+        in the same block (e.g. the grading of a ring is passed on to the
+        blocks connected to it). The grading of faces transferred from
+        other meshes is fixed and passed on, too.
+
+        Raises:
+            RuntimeError: Shared edges with different gradings and uniform
+                edges that could adopt different gradings at the same
+                distance (e.g. from differently graded parallel edges), all
+                conflicts are listed.
+        """
+        # block edges (block index, edge number) sharing the same points
+        blocks = self.blocks + self._interfaces
+        shared = {}
+        orientation = {}
+        for i, b in enumerate(blocks):
+            for axis, edges in enumerate(_AXIS_EDGES):
+                for k, (_, start, end) in enumerate(edges):
+                    p_start = getattr(b, start)
+                    p_end = getattr(b, end)
+                    if p_start is p_end:  # collapsed edge
+                        continue
+                    if p_start is None or p_end is None:  # transferred face
+                        continue
+                    key = frozenset([id(p_start), id(p_end)])
+                    if key not in shared:
+                        shared[key] = (id(p_start), [])
+                    shared[key][1].append((i, 4 * axis + k))
+                    reverse = id(p_start) != shared[key][0]
+                    orientation[(i, 4 * axis + k)] = (key, reverse)
+
+        def canonical(node, expansion):
+            # expansion relative to the orientation of the shared edge
+            return expansion.reverse() if orientation[node][1] else expansion
+
+        # breadth first search, passing the grading via shared edges is
+        # preferred over parallel edges within a block
+        expansions = {}
+        distance = {}
+        adopted = set()
+        # different gradings reaching an edge at the same distance
+        ambiguous = {}
+        queue = deque()
+        for node in orientation:
+            expansions[node] = blocks[node[0]].grading.edge_expansion(node[1])
+            if not expansions[node].uniform:
+                distance[node] = 0
+                queue.append(node)
+        while queue:
+            node = queue.popleft()
+            i, edge = node
+            neighbors = [(other, 0) for other in shared[orientation[node][0]][1]]
+            neighbors += [
+                ((i, other), 1)
+                for other in range(4 * (edge // 4), 4 * (edge // 4) + 4)
+                if (i, other) in orientation
+            ]
+            for other, cost in neighbors:
+                if other[0] >= len(self.blocks):  # other mesh, fixed
+                    continue
+                if cost == 0:
+                    expansion = canonical(other, canonical(node, expansions[node]))
+                else:
+                    expansion = expansions[node]
+                if distance[node] + cost == distance.get(other) and other in adopted:
+                    if not expansion.isclose(expansions[other]):
+                        ambiguous[other] = (distance[other], node, expansion)
+                if distance[node] + cost >= distance.get(other, np.inf):
+                    continue
+                distance[other] = distance[node] + cost
+                adopted.add(other)
+                expansions[other] = expansion
+                if cost == 0:
+                    queue.appendleft(other)
+                else:
+                    queue.append(other)
+
+        conflicts = []
+        for key, (_, nodes) in shared.items():
+            reference = canonical(nodes[0], expansions[nodes[0]])
+            for node in nodes[1:]:
+                if not canonical(node, expansions[node]).isclose(reference):
+                    b0, b1 = ["other mesh", "other mesh"]
+                    if nodes[0][0] < len(self.blocks):
+                        b0 = f"block {blocks[nodes[0][0]].id}"
+                    if node[0] < len(self.blocks):
+                        b1 = f"block {blocks[node[0]].id}"
+                    conflicts.append(
+                        f"{b0} e{nodes[0][1]} ({reference}) - {b1} e{node[1]} ({canonical(node, expansions[node])})"
+                    )
+        for node, (d, source, expansion) in ambiguous.items():
+            if d != distance[node]:  # reached on a shorter path later
+                continue
+            b = blocks[node[0]]
+            b_source = "other mesh"
+            if source[0] < len(self.blocks):
+                b_source = f"block {blocks[source[0]].id}"
+            conflicts.append(
+                f"block {b.id} e{node[1]} adopts {expansions[node]} or "
+                f"{expansion} (from {b_source} e{source[1]})"
+            )
+        if conflicts:
+            raise RuntimeError(
+                "Non-conformal or ambiguous grading:\n" + "\n".join(conflicts)
+            )
+
+        for i, b in enumerate(self.blocks):
+            if not any((i, edge) in adopted for edge in range(12)):
+                continue
+            edges = [expansions.get((i, edge)) for edge in range(12)]
+            for edge in range(12):  # collapsed edges
+                if edges[edge] is None:
+                    parallel = edges[4 * (edge // 4) : 4 * (edge // 4) + 4]
+                    edges[edge] = next(
+                        (x for x in parallel if x is not None),
+                        b.grading.edge_expansion(edge),
+                    )
+            if all(
+                edges[4 * axis].isclose(x)
+                for axis in range(3)
+                for x in edges[4 * axis : 4 * axis + 4]
+            ):
+                b.grading = Grading.simple(edges[0], edges[4], edges[8])
+            else:
+                b.grading = Grading.edge(*edges)
+
+    def quality(self, per_cell=False):
+        """Estimate the mesh quality without running blockMesh. The nodes
+        of each block are computed by transfinite interpolation (see
+        Block.nodes), non-orthogonality and skewness are evaluated for the
+        faces inside the blocks.
+
+        Args:
+            per_cell (bool, optional): Keep the values of all cells.
+
+        Returns:
+            Quality object with the values of the worst cell per block.
+        """
+        values = {
+            "aspect_ratio": [],
+            "skewness": [],
+            "non_orthogonality": [],
+            "determinant": [],
+        }
+        cells = []
+        for b in self.blocks:
+            q = cell_quality(b.nodes())
+            for key in values:
+                if key == "determinant":
+                    values[key].append(q[key].min())
+                else:
+                    values[key].append(q[key].max())
+            if per_cell:
+                cells.append(q)
+        return Quality(
+            **{key: np.array(x) for key, x in values.items()},
+            cells=cells if per_cell else None,
+        )
+
+    def validate(self, blocks=None, min_determinant=0, raise_error=True):
+        """Check the corners of the blocks for inverted (e.g. mis-ordered
+        points), twisted and collapsed blocks. Collapsing a block by using
+        the same point several times is allowed, different points at the
+        same position are not.
+
+        Args:
+            blocks (list, optional): Blocks to check, defaults to all blocks.
+            min_determinant (float, optional): Minimum scaled Jacobian at the
+                corners.
+            raise_error (bool, optional): Raise an error if a block is
+                invalid.
+
+        Raises:
+            ValueError: Invalid blocks, all of them are listed.
+
+        Returns:
+            list: Description of the invalid blocks.
+        """
+        if blocks is None:
+            blocks = self.blocks
+        if len(blocks) == 0:
+            return []
+        names = ["p0", "p1", "p2", "p3", "p4", "p5", "p6", "p7"]
+        points = [[getattr(b, name) for name in names] for b in blocks]
+        issues = _invalid_blocks(blocks, points, min_determinant)
+        if issues and raise_error:
+            raise ValueError("Invalid blocks:\n" + "\n".join(issues))
+        return issues
+
+    def check_conformity(self, raise_error=True):
+        """Check that blocks sharing a face have the same number of cells
+        along the edges of the face. The edges are matched by their points,
+        so this works for blocks with different orientation, e.g. if faces
+        were connected with the face setters.
+
+        Args:
+            raise_error (bool, optional): Raise an error if the mesh is not
+                conforming.
+
+        Raises:
+            ValueError: Non-conforming faces, all of them are listed.
+
+        Returns:
+            list: Description of the non-conforming faces.
+        """
+        edges = {}
+        for axis, axis_edges in enumerate(_AXIS_EDGES):
+            for name, start, end in axis_edges:
+                edges[name] = (axis, start, end)
+        faces = {}
+        for b in self.blocks:
+            cells = [b.cells_x1, b.cells_x2, b.cells_x3]
+            for pos, (points, face_edges) in _FACE_ENTITIES.items():
+                key = frozenset(id(getattr(b, x)) for x in points)
+                if len(key) < 3:  # face collapsed to a line
+                    continue
+                face = {}
+                for name in face_edges:
+                    axis, start, end = edges[name]
+                    p_start = getattr(b, start)
+                    p_end = getattr(b, end)
+                    if p_start is not p_end:
+                        face[frozenset([id(p_start), id(p_end)])] = (
+                            cells[axis],
+                            p_start,
+                            p_end,
+                        )
+                faces.setdefault(key, []).append((b, pos, face))
+        issues = []
+        for shared in faces.values():
+            if len(shared) < 2:
+                continue
+            names = " and ".join(f"face {pos} of block {b.id}" for b, pos, _ in shared)
+            names = names.capitalize()
+            if len(shared) > 2:
+                issues.append(f"{names} are the same face.")
+                continue
+            (_, _, face_a), (_, _, face_b) = shared
+            if face_a.keys() != face_b.keys():
+                issues.append(f"{names} are twisted against each other.")
+                continue
+            for key, (n_a, p_start, p_end) in face_a.items():
+                n_b = face_b[key][0]
+                if n_a != n_b and n_a != 0 and n_b != 0:
+                    issues.append(
+                        f"{names}: {n_a} and {n_b} cells "
+                        f"between points {p_start.id} and {p_end.id}."
+                    )
+        if issues and raise_error:
+            raise ValueError("Non-conforming faces:\n" + "\n".join(issues))
+        return issues
+
+    def discretization_error(self, refinement=None, n=1000):
+        """Compute the discretization error of all curved edges (arc,
+        polyLine, spline) with the number of cells and grading of the
+        blocks, e.g. to find the coarsest resolution within a geometric
+        tolerance.
+
+        Args:
+            refinement (float, optional): Refinement factor, see write.
+                Defaults to mesh.refinement.
+            n (int, optional): Number of points to sample the edges.
+
+        Returns:
+            list: EdgeDeviation objects, one per curved edge.
+        """
+        if refinement is None:
+            refinement = self.refinement
+        deviations = []
+        done = set()
+        for b in self.blocks:
+            for axis, edges in enumerate(_AXIS_EDGES):
+                for name, start, _ in edges:
+                    e = getattr(b, name)
+                    if e.type == "line" or id(e) in done:
+                        continue
+                    done.add(id(e))
+                    cells = [b.cells_x1, b.cells_x2, b.cells_x3][axis]
+                    expansion = b.grading.edge_expansion(int(name[1:]))
+                    if refinement != 1:
+                        refined = _refine_cells(cells, refinement)
+                        expansion = expansion.refine(cells, refined)
+                        cells = refined
+                    if e.p0 is not getattr(b, start):
+                        expansion = expansion.reverse()
+                    absolute, relative = e.discretization_error(cells, expansion, n=n)
+                    deviations.append(EdgeDeviation(e, cells, absolute, relative))
+        return deviations
+
+    def _curved_nodes(self, resolution):
+        """Nodes of the blocks with curved edges, see Block.nodes. With
+        resolution None the nodes of all blocks are computed."""
+        nodes = {}
+        for i, b in enumerate(self.blocks):
+            if resolution is None or any(
+                getattr(b, f"e{k}").type != "line" for k in range(12)
+            ):
+                nodes[i] = b.nodes(resolution)
+        return nodes
+
+    def block_volumes(self, resolution=20):
+        """Compute the volumes and centroids of all blocks. Blocks with
+        straight edges are computed from their corners, blocks with curved
+        edges are subdivided.
+
+        Args:
+            resolution (int, optional): Number of subdivisions per direction
+                of blocks with curved edges. If None, the cells of the blocks
+                are used, which gives the volume of the generated mesh.
+
+        Returns:
+            tuple: Volumes (n) and centroids (n, 3) of the blocks.
+        """
+        if len(self.blocks) == 0:
+            return np.zeros(0), np.zeros((0, 3))
+        names = ["p0", "p1", "p2", "p3", "p4", "p5", "p6", "p7"]
+        corners = [
+            [[p.x1, p.x2, p.x3] for p in [getattr(b, x) for x in names]]
+            for b in self.blocks
+        ]
+        volumes, centroids = hex_volumes(corners)
+        for i, nodes in self._curved_nodes(resolution).items():
+            volume, centroid = hex_volumes(np.stack(_corners(nodes), axis=-2))
+            volumes[i] = volume.sum()
+            if volumes[i] != 0:
+                centroids[i] = (volume[..., None] * centroid).sum(axis=(0, 1, 2))
+                centroids[i] /= volumes[i]
+        return volumes, centroids
+
+    def patch_areas(self, resolution=20):
+        """Compute the areas and centroids of all patches, e.g. of the free
+        surface. Faces of blocks with curved edges are subdivided.
+
+        Args:
+            resolution (int, optional): Number of subdivisions per direction
+                of faces with curved edges. If None, the cells of the blocks
+                are used, which gives the area of the generated mesh.
+
+        Returns:
+            dict: Area and centroid per patch name.
+        """
+        curved = self._curved_nodes(resolution)
+        surfaces = {}
+        for i, nodes in curved.items():
+            b = self.blocks[i]
+            for pos, surface in [
+                ("bottom", nodes[:, :, 0]),
+                ("top", nodes[:, :, -1]),
+                ("left", nodes[0]),
+                ("right", nodes[-1]),
+                ("front", nodes[:, 0]),
+                ("back", nodes[:, -1]),
+            ]:
+                key = frozenset(id(getattr(b, x)) for x in _FACE_ENTITIES[pos][0])
+                surfaces[key] = surface
+        faces = [(p.name.split()[-1], face) for p in self.patches for face in p.faces]
+        if len(faces) == 0:
+            return {}
+        areas, centroids = quad_areas(
+            [[[x.x1, x.x2, x.x3] for x in face] for _, face in faces]
+        )
+        areas = np.linalg.norm(areas, axis=-1)
+        for k, (_, face) in enumerate(faces):
+            surface = surfaces.get(frozenset(id(x) for x in face))
+            if surface is not None:
+                quads = [
+                    surface[:-1, :-1],
+                    surface[1:, :-1],
+                    surface[1:, 1:],
+                    surface[:-1, 1:],
+                ]
+                area, centroid = quad_areas(np.stack(quads, axis=-2))
+                area = np.linalg.norm(area, axis=-1)
+                areas[k] = area.sum()
+                if areas[k] > 0:
+                    centroids[k] = (area[..., None] * centroid).sum(axis=(0, 1))
+                    centroids[k] /= areas[k]
+        patches = {}
+        for name in dict.fromkeys(name for name, _ in faces):
+            mask = np.array([x == name for x, _ in faces])
+            area = areas[mask].sum()
+            if area > 0:
+                centroid = (areas[mask, None] * centroids[mask]).sum(axis=0) / area
+            else:  # degenerate faces only
+                centroid = centroids[mask].mean(axis=0)
+            patches[name] = (area, centroid)
+        return patches
+
+    def statistics(self, regions=None, refinement=None, bytes_per_cell=1000):
+        """Compute the size of the mesh from the numbers of cells and the
+        topology of the blocks, without running blockMesh. Undefined
+        numbers of cells are computed as on write.
+
+        Args:
+            regions (dict, optional): Parts of the mesh to compute the number
+                of cells for, e.g. {"crystal": cylinder, "melt": [b1, b2]}.
+                Values can be blocks, Cylinders, Rings or lists of them.
+            refinement (float, optional): Refinement factor, see write.
+                Defaults to mesh.refinement.
+            bytes_per_cell (float, optional): Memory required by the solver
+                per cell, about 1 kB for typical OpenFOAM solvers.
+
+        Raises:
+            RuntimeError: Numbers of cells that cannot be computed (neither
+                cell size nor cell budget given).
+
+        Returns:
+            Statistics object.
+        """
+        if refinement is None:
+            refinement = self.refinement
+        self._resolve_cells()
+        cells = {}
+        n_cells = 0
+        internal_faces = 0
+        points = 0
+        vertices = set()
+        edges = {}
+        faces = {}
+        for b in self.blocks:
+            n = [b.cells_x1, b.cells_x2, b.cells_x3]
+            if refinement != 1:
+                n = [_refine_cells(x, refinement) for x in n]
+            n = [int(x) for x in n]
+            cells[id(b)] = n[0] * n[1] * n[2]
+            n_cells += cells[id(b)]
+            internal_faces += (
+                (n[0] - 1) * n[1] * n[2]
+                + n[0] * (n[1] - 1) * n[2]
+                + n[0] * n[1] * (n[2] - 1)
+            )
+            points += (n[0] - 1) * (n[1] - 1) * (n[2] - 1)
+            for name in ["p0", "p1", "p2", "p3", "p4", "p5", "p6", "p7"]:
+                vertices.add(id(getattr(b, name)))
+            for axis, axis_edges in enumerate(_AXIS_EDGES):
+                for _, start, end in axis_edges:
+                    if getattr(b, start) is getattr(b, end):  # collapsed edge
+                        continue
+                    key = frozenset([id(getattr(b, start)), id(getattr(b, end))])
+                    edges[key] = n[axis] - 1
+            for pos, (names, _) in _FACE_ENTITIES.items():
+                key = frozenset(id(getattr(b, name)) for name in names)
+                if len(key) < 3:  # face collapsed to a line
+                    continue
+                a, c = _FACE_AXES[pos]
+                faces.setdefault(key, [n[a] * n[c], (n[a] - 1) * (n[c] - 1), 0])
+                faces[key][2] += 1
+        points += len(vertices) + sum(edges.values())
+        boundary_faces = 0
+        for face_cells, face_points, count in faces.values():
+            points += face_points
+            if count > 1:
+                internal_faces += face_cells
+            else:
+                boundary_faces += face_cells
+        patches = {}
+        for p in self.patches:
+            name = p.name.split()[-1]
+            patches[name] = 0
+            for face in p.faces:
+                key = frozenset(id(x) for x in face)
+                if key in faces:
+                    patches[name] += faces[key][0]
+        if regions is not None:
+            regions = {
+                name: sum(cells.get(id(b), 0) for b in _region_blocks(region))
+                for name, region in regions.items()
+            }
+        return Statistics(
+            n_cells,
+            points,
+            internal_faces,
+            boundary_faces,
+            patches,
+            boundary_faces - sum(patches.values()),
+            n_cells * bytes_per_cell,
+            regions,
+        )
+
+    def distribute_cells(self, budget, min_cells=None):
+        """Choose the numbers of cells of all blocks to match a total number
+        of cells while minimizing the maximum aspect ratio of the cells, i.e.,
+        the ratio of the largest to the smallest cell edge per block.
+        Starting from a uniform cell size within the budget, the connected
+        directions are refined one cell at a time, always choosing the one
+        that gives the lowest maximum aspect ratio (usually the direction with
+        the largest cells of the worst block). mesh.cell_size and
+        block.cell_size act as relative cell sizes (weights) if given.
+        Connected block directions get the same number of cells, numbers of
+        cells that were set explicitly are kept and directions with a single
+        explicit cell (2D, wedge) are ignored. With mesh.cell_budget, blocks
+        can be created without numbers of cells and this is called on write.
+
+        Args:
+            budget (int): Total number of cells.
+            min_cells (dict or list, optional): Minimum numbers of cells per
+                block of some regions, e.g. {block: [x1, x2, x3]} or
+                [(cylinder, [x1, x2, x3]), ([b1, b2], [x1, x2, x3])]. Regions
+                can be blocks, Cylinders, Rings or lists of them.
+
+        Returns:
+            int: Resulting total number of cells.
+        """
+        groups = self._connected_directions()
+        fixed = self._fixed_cells(groups)
+        # cell edges per unit of the (relative) cell size
+        lengths = self._edge_lengths(default_size=1)
+        roots = list(dict.fromkeys(groups.values()))
+        index = {root: k for k, root in enumerate(roots)}
+        block_roots = np.array(
+            [
+                [index[groups[(i, axis)]] for axis in range(3)]
+                for i in range(len(self.blocks))
+            ],
+            dtype=int,
+        ).reshape(-1, 3)
+        length = np.array(
+            [
+                [lengths.get((i, axis), 0) for axis in range(3)]
+                for i in range(len(self.blocks))
+            ],
+            dtype=float,
+        ).reshape(-1, 3)
+        required = np.zeros(len(roots))
+        np.maximum.at(required, block_roots.ravel(), length.ravel())
+        free = np.array([root not in fixed for root in roots], dtype=bool)
+        minimum = np.ones(len(roots))
+        if isinstance(min_cells, dict):
+            min_cells = min_cells.items()
+        for region, val in min_cells or []:
+            for b in _region_blocks(region):
+                k = block_roots[self.blocks.index(b)]
+                minimum[k] = np.maximum(minimum[k], val)
+        # directions taken into account for the aspect ratio
+        single = np.array([fixed.get(root) == 1 for root in roots], dtype=bool)
+        valid = (length > 0) & ~single[block_roots]
+
+        def total(cells):
+            return int(np.prod(cells[block_roots], axis=1).sum())
+
+        def max_aspect_ratio(cells):
+            sizes = length / cells[block_roots]
+            largest = np.where(valid, sizes, 0).max(axis=1, initial=0)
+            smallest = np.where(valid, sizes, np.inf).min(axis=1, initial=np.inf)
+            ratio = largest[valid.any(axis=1)] / smallest[valid.any(axis=1)]
+            return float(ratio.max(initial=1))
+
+        base = np.array([fixed.get(root, 1) for root in roots], dtype=float)
+
+        def scaled(scale):
+            return np.where(free, np.maximum(minimum, required * scale), base)
+
+        # bisection for a uniform (relative) cell size within the budget
+        low, high = 0, 1
+        while total(scaled(high)) < budget:
+            high *= 2
+            if high > 1e12:
+                break
+        for _ in range(100):
+            mid = (low + high) / 2
+            if total(scaled(mid)) < budget:
+                low = mid
+            else:
+                high = mid
+        cells = np.floor(scaled(low)).astype(int)
+
+        # refine the group giving the lowest maximum aspect ratio, i.e., the
+        # direction with the largest cells of the worst block, preferring the
+        # largest cells, until the budget is reached
+        n_cells = total(cells)
+        while True:
+            best = None
+            for root in np.flatnonzero(free):
+                relative_size = required[root] / cells[root]
+                cells[root] += 1
+                n_new = total(cells)
+                if n_new <= budget:
+                    key = (max_aspect_ratio(cells), -relative_size)
+                    if best is None or key < best[0]:
+                        best = (key, root, n_new)
+                cells[root] -= 1
+            if best is None:
+                break
+            cells[best[1]] += 1
+            n_cells = best[2]
+
+        # coarsen the groups with the smallest cells if the minimum numbers
+        # of cells exceed the budget
+        while n_cells > budget:
+            candidates = np.flatnonzero(free & (cells > minimum))
+            if len(candidates) == 0:
+                break
+            root = candidates[np.argmin(required[candidates] / cells[candidates])]
+            cells[root] -= 1
+            n_cells = total(cells)
+        self._set_cells(
+            groups, {root: int(cells[index[root]]) for root in roots}, fixed
+        )
+        return n_cells
+
+    def write(self, directory="./system", refinement=None, propagate=True):
+        """Write the blockMeshDict.
+
+        Args:
+            directory (str, optional): Output directory.
+            refinement (float, optional): Factor to scale the number of cells
+                of all blocks, overrides mesh.refinement. Gradings are adapted
+                so that the first cell height scales accordingly. Directions
+                with a single cell (2D, wedge) are not refined.
+            propagate (bool, optional): Pass the grading on to uniformly
+                graded edges of connected blocks, see propagate_grading.
+                Otherwise the gradings are written as they are.
+        """
+        if refinement is None:
+            refinement = self.refinement
+        self._resolve_cells()
+        self.validate()
+        self.check_conformity()
+        if propagate:
+            self.propagate_grading()
         if not os.path.exists(directory):
             os.makedirs(directory)
         with open(f"{directory}/blockMeshDict", "w") as f:
@@ -77,8 +867,14 @@ class Mesh:
                 f.write(
                     f"    hex ({b.p0.id} {b.p1.id} {b.p2.id} {b.p3.id} {b.p4.id} {b.p5.id} {b.p6.id} {b.p7.id})\n"
                 )
-                f.write(f"    ({b.cells_x1} {b.cells_x2} {b.cells_x3})\n")
-                f.write(f"    {b.grading}\n")
+                cells = [b.cells_x1, b.cells_x2, b.cells_x3]
+                grading = b.grading
+                if refinement != 1:
+                    cells_refined = [_refine_cells(n, refinement) for n in cells]
+                    grading = grading.refine(cells, cells_refined)
+                    cells = cells_refined
+                f.write(f"    ({cells[0]} {cells[1]} {cells[2]})\n")
+                f.write(f"    {grading}\n")
             f.write(");\n\n")
             f.write("patches\n(\n")
             for p in self.patches:
@@ -94,6 +890,21 @@ class Mesh:
                 "// * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * //\n"
             )
 
+    def write_family(self, refinements, directory="./system_{}"):
+        """Write several refinement levels of the mesh, e.g. for mesh
+        convergence studies.
+
+        Args:
+            refinements (dict or list): Refinement factors, e.g.
+                {"coarse": 0.5, "medium": 1, "fine": 2}.
+            directory (str, optional): Output directory, formatted with the
+                name (dict key) or factor of the refinement level.
+        """
+        if not isinstance(refinements, dict):
+            refinements = {x: x for x in refinements}
+        for name, refinement in refinements.items():
+            self.write(directory.format(name), refinement)
+
 
 class Block:
     """Block of the mesh. Naming of points and edges following openFOAM standard."""
@@ -126,6 +937,7 @@ class Block:
         self._cells_x2 = 0
         self._cells_x3 = 0
         self.grading = "simpleGrading (1 1 1)"
+        self.cell_size = None
 
         self._p0 = None
         self._p1 = None
@@ -151,12 +963,26 @@ class Block:
 
         self._created = False
 
-    def create(self):
-        """Create points and edges"""
+    def create(self, validate=False):
+        """Create points and edges
+
+        Args:
+            validate (bool, optional): Reject inverted, twisted and
+                collapsed blocks right away, see Mesh.validate. All blocks
+                are validated on write anyway, so points can still be moved
+                after creating the block.
+        """
         if self._created:
             raise RuntimeError("This block was already crated.")
         if self._cells_x1 == 0 or self._cells_x2 == 0 or self._cells_x3 == 0:
-            raise RuntimeError("Number of cells not defined.")
+            if (
+                self.cell_size is None
+                and self.mesh.cell_size is None
+                and self.mesh.cell_budget is None
+            ):
+                raise RuntimeError("Number of cells not defined.")
+        if validate:
+            self._check_points()
 
         if self._p0 is None:
             self._p0 = self.mesh._add_point(
@@ -365,6 +1191,30 @@ class Block:
         self._created = True
         self.mesh._add_block(self)
 
+    def _check_points(self):
+        """Validate the block before its points and edges are added to the
+        mesh, see Mesh.validate."""
+        points = {}
+        for k in range(8):
+            p = getattr(self, f"_p{k}")
+            if p is None:
+                p = Point(*getattr(self, f"_p{k}_coords"))
+            points[f"p{k}"] = p
+        for name in points:
+            p = points[name]
+            for _ in range(8):  # references to other points
+                if type(p) is not str:
+                    break
+                if p not in points or p == name:
+                    raise ValueError("invalid point definition")
+                p = points[p]
+            points[name] = p
+        if any(type(p) is str for p in points.values()):
+            raise ValueError("invalid point definition")
+        issues = _invalid_blocks([self], [list(points.values())])
+        if issues:
+            raise ValueError("Invalid blocks:\n" + "\n".join(issues))
+
     def set_connection(self, other, pos):
         """Set connection to other block. This works only if the
         coordinate systems have the same orientation!
@@ -449,11 +1299,171 @@ class Block:
                 "This position does not exist.\nThe following values are allowed for 'pos': top, bottom, left, right, front, back"
             )
 
+    def transfer(self, mesh, pos, memo=None):
+        """Copy a face of this block into another mesh, e.g. to create
+        conformal interfaces between separate meshes. Points, edges
+        (including spline / arc points), cell numbers and grading are
+        copied exactly. The returned block is not part of the other mesh,
+        it only serves as connection for new blocks via set_connection.
+        Its grading is passed on to the connected blocks when writing the
+        mesh, see Mesh.propagate_grading.
+
+        Args:
+            mesh (Mesh): Mesh to copy the face to.
+            pos (str): Face to copy: top, bottom, left, right, front, back
+            memo (dict, optional): Copies of points and edges that were
+                already transferred, to share them between several blocks.
+
+        Returns:
+            Block object.
+        """
+        if not self._created:
+            raise RuntimeError("This block was not created yet.")
+        if pos not in _FACE_ENTITIES:
+            raise ValueError(
+                "This position does not exist.\nThe following values are allowed for 'pos': top, bottom, left, right, front, back"
+            )
+        if memo is None:
+            memo = {}
+        points, edges = _FACE_ENTITIES[pos]
+        block = Block(mesh)
+        for name in points:
+            p = getattr(self, name)
+            if id(p) not in memo:
+                memo[id(p)] = mesh._add_point(p.x1, p.x2, p.x3)
+            setattr(block, f"_{name}", memo[id(p)])
+        for name in edges:
+            e = getattr(self, name)
+            if id(e) not in memo:
+                copy = mesh._add_edge(memo[id(e.p0)], memo[id(e.p1)])
+                copy.type = e.type
+                copy.points = [list(x) for x in e.points]
+                memo[id(e)] = copy
+            setattr(block, name, memo[id(e)])
+        block._cells_x1 = self._cells_x1
+        block._cells_x2 = self._cells_x2
+        block._cells_x3 = self._cells_x3
+        block.grading = self.grading
+        block._created = True
+        mesh._interfaces.append(block)
+        return block
+
+    def set_first_cell_size(self, direction, size, pos="xmin"):
+        """Set the grading in one direction such that the cells at xmin or
+        xmax have the given size. The expansion is computed for each edge
+        separately from its actual length, resulting in edgeGrading.
+
+        Args:
+            direction (str): x1, x2 or x3
+            size (float): Size of the first cell.
+            pos (str, optional): Position of the first cell, xmin or xmax.
+        """
+        if not self._created:
+            raise RuntimeError("This block was not created yet.")
+        if direction not in ["x1", "x2", "x3"]:
+            raise ValueError(
+                f"Direction '{direction}' not defined. Use 'x1', 'x2' or 'x3'."
+            )
+        axis = ["x1", "x2", "x3"].index(direction)
+        cells = [self._cells_x1, self._cells_x2, self._cells_x3][axis]
+        expansions = self.grading.to_edge().expansions
+        for i, (name, start, end) in enumerate(_AXIS_EDGES[axis]):
+            if getattr(self, start) is getattr(self, end):  # collapsed edge
+                continue
+            length = getattr(self, name).length()
+            expansions[4 * axis + i] = Expansion.from_first_cell(
+                length, cells, size, pos
+            )
+        self.grading = Grading.edge(*expansions)
+
+    def nodes(self, resolution=None):
+        """Estimate the positions of the mesh nodes by transfinite
+        interpolation between the edges, taking into account curved edges
+        and grading.
+
+        Args:
+            resolution (int, optional): Use this number of uniform cells in
+                all directions instead of the cells and grading of the block.
+
+        Returns:
+            np.array: Node positions of shape
+            (cells_x1 + 1, cells_x2 + 1, cells_x3 + 1, 3).
+        """
+        if not self._created:
+            raise RuntimeError("This block was not created yet.")
+        if resolution is None:
+            cells = [int(self._cells_x1), int(self._cells_x2), int(self._cells_x3)]
+        else:
+            cells = [int(resolution)] * 3
+        edges = []
+        parameters = []
+        for axis, axis_edges in enumerate(_AXIS_EDGES):
+            lam = []
+            for k, (name, start, end) in enumerate(axis_edges):
+                if resolution is None:
+                    lam.append(self.grading.nodes(4 * axis + k, cells[axis]))
+                else:
+                    lam.append(np.linspace(0, 1, cells[axis] + 1))
+                e = getattr(self, name)
+                if e.p0 is getattr(self, start):
+                    edges.append(e.position(lam[-1]))
+                else:
+                    edges.append(e.position(1 - lam[-1]))
+            parameters.append(np.mean(lam, axis=0))
+        u, v, w = np.meshgrid(*parameters, indexing="ij")
+        u = u[..., None]
+        v = v[..., None]
+        w = w[..., None]
+        e = [x[:, None, None] for x in edges[:4]]
+        e += [x[None, :, None] for x in edges[4:8]]
+        e += [x[None, None, :] for x in edges[8:]]
+        p = [
+            np.array([x.x1, x.x2, x.x3], dtype=float)
+            for x in [self.p0, self.p1, self.p2, self.p3]
+            + [self.p4, self.p5, self.p6, self.p7]
+        ]
+        # sum of the edge interpolations minus twice the trilinear
+        # interpolation of the corners
+        edge_sum = (
+            (1 - v) * (1 - w) * e[0]
+            + v * (1 - w) * e[1]
+            + v * w * e[2]
+            + (1 - v) * w * e[3]
+            + (1 - u) * (1 - w) * e[4]
+            + u * (1 - w) * e[5]
+            + u * w * e[6]
+            + (1 - u) * w * e[7]
+            + (1 - u) * (1 - v) * e[8]
+            + u * (1 - v) * e[9]
+            + u * v * e[10]
+            + (1 - u) * v * e[11]
+        )
+        corners = (
+            (1 - u) * (1 - v) * (1 - w) * p[0]
+            + u * (1 - v) * (1 - w) * p[1]
+            + u * v * (1 - w) * p[2]
+            + (1 - u) * v * (1 - w) * p[3]
+            + (1 - u) * (1 - v) * w * p[4]
+            + u * (1 - v) * w * p[5]
+            + u * v * w * p[6]
+            + (1 - u) * v * w * p[7]
+        )
+        return edge_sum - 2 * corners
+
     def set_number_of_cells(self, x1=10, x2=10, x3=10):
         self._cells_x1 = x1
         self._cells_x2 = x2
         self._cells_x3 = x3
 
+    @property
+    def grading(self):
+        """Grading object, can be set as string, e.g. "simpleGrading (1 1 1)"."""
+        return self._grading
+
+    @grading.setter
+    def grading(self, val):
+        self._grading = Grading.parse(val)
+
     @property
     def cells_x1(self):
         return self._cells_x1
@@ -500,7 +1510,7 @@ class Block:
             raise RuntimeError("This point exists already.")
         if type(val) == Point:
             self._p0 = val
-        if type(val) == str:
+        elif type(val) == str:
             if self._created:
                 raise ValueError("Cannot set reference to own point, block was already created")
             self._p0 = val
@@ -705,6 +1715,97 @@ class Block:
         self._p7 = val[3]
 
 
+# points and edges belonging to the faces of a block
+_FACE_ENTITIES = {
+    "top": (["p4", "p5", "p6", "p7"], ["e3", "e2", "e6", "e7"]),
+    "bottom": (["p0", "p1", "p2", "p3"], ["e0", "e1", "e5", "e4"]),
+    "left": (["p0", "p3", "p4", "p7"], ["e4", "e7", "e8", "e11"]),
+    "right": (["p1", "p2", "p5", "p6"], ["e5", "e6", "e9", "e10"]),
+    "front": (["p0", "p1", "p4", "p5"], ["e0", "e3", "e8", "e9"]),
+    "back": (["p3", "p2", "p7", "p6"], ["e1", "e2", "e11", "e10"]),
+}
+
+# directions spanning the faces of a block
+_FACE_AXES = {
+    "top": (0, 1),
+    "bottom": (0, 1),
+    "left": (1, 2),
+    "right": (1, 2),
+    "front": (0, 2),
+    "back": (0, 2),
+}
+
+# edges in x1, x2 and x3 direction with their start and end points
+_AXIS_EDGES = [
+    [("e0", "p0", "p1"), ("e1", "p3", "p2"), ("e2", "p7", "p6"), ("e3", "p4", "p5")],
+    [("e4", "p0", "p3"), ("e5", "p1", "p2"), ("e6", "p5", "p6"), ("e7", "p4", "p7")],
+    [("e8", "p0", "p4"), ("e9", "p1", "p5"), ("e10", "p2", "p6"), ("e11", "p3", "p7")],
+]
+
+
+def _invalid_blocks(blocks, points, min_determinant=0):
+    """Description of the invalid blocks, see Mesh.validate."""
+    corners = [[[p.x1, p.x2, p.x3] for p in x] for x in points]
+    jacobians = corner_jacobians(corners)
+    # corners with an edge collapsed on purpose
+    intended = np.array(
+        [
+            [
+                any(x[k] is x[i] for i in neighbors)
+                for k, *neighbors in _CORNER_NEIGHBORS
+            ]
+            for x in points
+        ]
+    )
+    issues = []
+    for b, x, jacobian, skip in zip(blocks, points, jacobians, intended):
+        name = "Block" if b.id < 0 else f"Block {b.id}"
+        name += f" (p0 = [{x[0].x1}, {x[0].x2}, {x[0].x3}])"
+        valid = ~np.isnan(jacobian)
+        collapsed = [f"p{k}" for k in np.flatnonzero(~valid & ~skip)]
+        if collapsed:
+            issues.append(
+                f"{name} is collapsed at {', '.join(collapsed)}, use the "
+                "same point object to collapse a block."
+            )
+        valid &= ~skip
+        if not valid.any():
+            continue
+        if (jacobian[valid] < 0).all():
+            issues.append(f"{name} is inverted, the points are left-handed.")
+            continue
+        twisted = np.flatnonzero(valid & (jacobian <= min_determinant))
+        if len(twisted) > 0:
+            text = ", ".join(f"p{k} ({jacobian[k]:.3g})" for k in twisted)
+            issues.append(f"{name} is twisted at {text}.")
+    return issues
+
+
+def _region_blocks(region):
+    """Blocks of a Block, Cylinder, Ring or list of them."""
+    if isinstance(region, Block):
+        return [region]
+    if isinstance(region, (list, tuple)):
+        return [b for x in region for b in _region_blocks(x)]
+    if hasattr(region, "core_blocks"):  # Cylinder
+        return region.core_blocks + region.ring.blocks
+    return list(region.blocks)
+
+
+def _refine_cells(n, refinement):
+    """Scaled number of cells, single cells (2D, wedge) are kept."""
+    if n == 1:
+        return n
+    return max(1, int(round(n * refinement)))
+
+
+def _evaluate_size(size, x):
+    """Evaluate a cell size (float or function of coordinates) at points x."""
+    if callable(size):
+        size = size(x)
+    return np.broadcast_to(np.asarray(size, dtype=float), (len(x),))
+
+
 @dataclass
 class Point:
     """Point in the mesh."""
@@ -729,6 +1830,298 @@ class Edge:
         self.type = "line"
         self.points = []
 
+    def position(self, lam, n=100):
+        """Points on the edge, parametrized by the arc length.
+
+        Args:
+            lam (np.array): Relative arc length from p0 (0) to p1 (1).
+            n (int, optional): Number of points to sample curved edges.
+
+        Returns:
+            np.array: Points of shape (len(lam), 3).
+        """
+        x = self.sample(n if self.type != "line" else 2)
+        s = np.concatenate([[0], np.cumsum(np.linalg.norm(np.diff(x, axis=0), axis=1))])
+        if s[-1] == 0:  # collapsed edge
+            return np.repeat(x[:1], len(lam), axis=0)
+        return np.array([np.interp(lam, s / s[-1], x[:, i]) for i in range(3)]).T
+
+    def length(self, n=50):
+        """Length of the edge.
+
+        Args:
+            n (int, optional): Number of points to sample curved edges.
+
+        Returns:
+            float
+        """
+        return np.linalg.norm(np.diff(self.sample(n), axis=0), axis=1).sum()
+
+    def sample(self, n=50):
+        """Sample the edge as interpolated by blockMesh.
+
+        Args:
+            n (int, optional): Number of points.
+
+        Returns:
+            np.array: Points of shape (n, 3) from p0 to p1.
+        """
+        start = np.array([self.p0.x1, self.p0.x2, self.p0.x3], dtype=float)
+        end = np.array([self.p1.x1, self.p1.x2, self.p1.x3], dtype=float)
+        t = np.linspace(0, 1, n)
+        if self.type == "arc":
+            return _sample_arc(start, np.array(self.points[0], dtype=float), end, t)
+        if self.type in ["polyLine", "spline"] and len(self.points) > 0:
+            knots = np.array([start, *self.points, end], dtype=float)
+            # remove duplicate knots, e.g. points including the end points
+            distance = np.linalg.norm(np.diff(knots, axis=0), axis=1)
+            knots = knots[np.concatenate([[True], distance > 0])]
+            if len(knots) < 2:  # collapsed edge
+                return np.repeat(start[None], n, axis=0)
+            # chord length parameter of the knots
+            param = np.concatenate(
+                [[0], np.cumsum(np.linalg.norm(np.diff(knots, axis=0), axis=1))]
+            )
+            param /= param[-1]
+            if self.type == "polyLine":
+                return np.array([np.interp(t, param, knots[:, i]) for i in range(3)]).T
+            return _sample_catmull_rom(knots, param, t)
+        return start + t[:, None] * (end - start)
+
+    def discretization_error(self, cells, expansion=None, samples=None, n=1000):
+        """Maximum deviation between the edge and the straight cell edges of
+        the mesh, i.e., the error made by discretizing a curved edge.
+
+        Args:
+            cells (int): Number of cells along the edge.
+            expansion (Expansion, optional): Grading from p0 to p1, uniform
+                by default.
+            samples (np.array, optional): Points on the true shape, e.g. the
+                function used for a spline. Defaults to the edge itself.
+            n (int, optional): Number of points to sample the edge.
+
+        Returns:
+            tuple: Absolute deviation and deviation relative to the length
+            of the cell edge.
+        """
+        if expansion is None:
+            lam = np.linspace(0, 1, int(cells) + 1)
+        else:
+            lam = Expansion.parse(expansion).nodes(int(cells))
+        nodes = self.position(lam, n)
+        if samples is None:
+            x = self.sample(n)
+        else:
+            x = np.array(samples, dtype=float)
+        s = np.concatenate([[0], np.cumsum(np.linalg.norm(np.diff(x, axis=0), axis=1))])
+        if s[-1] == 0:  # collapsed edge
+            return 0.0, 0.0
+        segment = np.clip(
+            np.searchsorted(lam, s / s[-1], side="right") - 1, 0, len(lam) - 2
+        )
+        start = nodes[segment]
+        chord = nodes[segment + 1] - start
+        length = np.einsum("ij,ij->i", chord, chord)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.clip(
+                np.nan_to_num(np.einsum("ij,ij->i", x - start, chord) / length), 0, 1
+            )
+        distance = np.linalg.norm(x - start - t[:, None] * chord, axis=1)
+        absolute = np.zeros(len(lam) - 1)
+        np.maximum.at(absolute, segment, distance)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            relative = np.nan_to_num(
+                absolute / np.linalg.norm(np.diff(nodes, axis=0), axis=1)
+            )
+        return float(absolute.max()), float(relative.max())
+
+    def set_sampled_points(self, samples, tolerance, kind=None):
+        """Define the shape of the edge by densely sampled data, e.g.
+        a measured interface shape. The samples are downsampled with the
+        Douglas-Peucker algorithm (polyLine) or to the fewest knots evenly
+        spaced along the arc length (spline), whichever needs less points to
+        stay within the tolerance. Splines are checked with the Catmull-Rom
+        interpolation of blockMesh.
+
+        Args:
+            samples (list): Points [[x1, x2, x3], ...] along the edge,
+                starting and ending at the points of the edge (in either
+                order) within the tolerance.
+            tolerance (float): Maximum allowed deviation from the samples.
+            kind (str, optional): Force "polyLine" or "spline".
+
+        Raises:
+            ValueError: The samples don't end at the points of the edge.
+
+        Returns:
+            str: Selected edge type.
+        """
+        samples = np.array(samples, dtype=float)
+        start = np.array([self.p0.x1, self.p0.x2, self.p0.x3])
+        end = np.array([self.p1.x1, self.p1.x2, self.p1.x3])
+        distance = np.linalg.norm(samples[[0, -1]] - [start, end], axis=1)
+        if (distance > tolerance).any():
+            distance = np.linalg.norm(samples[[-1, 0]] - [start, end], axis=1)
+            if (distance > tolerance).any():
+                raise ValueError(
+                    "The first and last sample must coincide with the points of the edge."
+                )
+            samples = samples[::-1]
+
+        poly_line = douglas_peucker(samples, tolerance)
+        spline = None
+        if kind is None or kind == "spline":
+            # arc length of the samples
+            s = np.concatenate(
+                [[0], np.cumsum(np.linalg.norm(np.diff(samples, axis=0), axis=1))]
+            )
+
+            def knots(n):
+                mask = np.zeros(len(samples), dtype=bool)
+                if n >= len(samples):
+                    mask[:] = True
+                else:
+                    mask[np.searchsorted(s, np.linspace(0, s[-1], n)[:-1])] = True
+                    mask[-1] = True
+                return mask
+
+            def fits(n):
+                # Catmull-Rom spline as in blockMesh, see sample
+                x = samples[knots(n)]
+                param = np.concatenate(
+                    [[0], np.cumsum(np.linalg.norm(np.diff(x, axis=0), axis=1))]
+                )
+                param /= param[-1]
+                t = np.linspace(0, 1, 10 * len(samples))
+                curve = _sample_catmull_rom(x, param, t)
+                return _distance_to_polyline(samples, curve).max() <= tolerance
+
+            # bisection for the number of knots, a forced spline may need
+            # more knots than the polyLine
+            low = 2
+            high = max(int(poly_line.sum()), 3)
+            if kind == "spline":
+                while high < len(samples) and not fits(high):
+                    low, high = high, min(2 * high, len(samples))
+            if fits(high):
+                while high - low > 1:
+                    n = (low + high) // 2
+                    if fits(n):
+                        high = n
+                    else:
+                        low = n
+                spline = knots(high)
+        if kind is None:
+            if spline is not None and spline.sum() < poly_line.sum():
+                kind = "spline"
+            else:
+                kind = "polyLine"
+        if kind == "polyLine":
+            mask = poly_line
+        elif kind == "spline":
+            if spline is None:
+                raise ValueError(
+                    f"No spline through the samples within the tolerance {tolerance}."
+                )
+            mask = spline
+        else:
+            raise ValueError(
+                f"Edge type '{kind}' not supported. Use 'polyLine' or 'spline'."
+            )
+
+        self.type = kind
+        self.points = samples[mask][1:-1].tolist()
+        return kind
+
+
+def _distance_to_polyline(points, polyline):
+    """Distance of points to a densely sampled polyline."""
+    _, i = spatial.cKDTree(polyline).query(points)
+    distance = np.full(len(points), np.inf)
+    for j in [i - 1, i]:
+        j = np.clip(j, 0, len(polyline) - 2)
+        start = polyline[j]
+        segment = polyline[j + 1] - start
+        length = np.einsum("ij,ij->i", segment, segment)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.einsum("ij,ij->i", points - start, segment) / length
+        t = np.clip(np.nan_to_num(t), 0, 1)
+        d = np.linalg.norm(points - start - t[:, None] * segment, axis=1)
+        distance = np.minimum(distance, d)
+    return distance
+
+
+def _sample_arc(start, mid, end, t):
+    """Points on the circular arc through start, mid and end."""
+    a = mid - start
+    b = end - start
+    normal = np.cross(a, b)
+    if np.linalg.norm(normal) == 0:  # degenerated arc
+        return start + t[:, None] * (end - start)
+    center = start + np.cross(a.dot(a) * b - b.dot(b) * a, normal) / (
+        2 * normal.dot(normal)
+    )
+    x = start - center
+    y = np.cross(normal / np.linalg.norm(normal), x)
+    r = end - center
+    angle = np.arctan2(r.dot(y), r.dot(x)) % (2 * np.pi)
+    phi = t[:, None] * angle
+    return center + np.cos(phi) * x + np.sin(phi) * y
+
+
+def _sample_catmull_rom(knots, param, t):
+    """Points on the Catmull-Rom spline through the knots, as used for
+    spline edges in blockMesh."""
+    # extrapolated end points
+    knots = np.concatenate(
+        [[2 * knots[0] - knots[1]], knots, [2 * knots[-1] - knots[-2]]]
+    )
+    segment = np.clip(np.searchsorted(param, t, side="right") - 1, 0, len(param) - 2)
+    mu = ((t - param[segment]) / (param[segment + 1] - param[segment]))[:, None]
+    p0, p1, p2, p3 = [knots[segment + i] for i in range(4)]
+    return 0.5 * (
+        2 * p1
+        + (p2 - p0) * mu
+        + (2 * p0 - 5 * p1 + 4 * p2 - p3) * mu ** 2
+        + (3 * p1 - p0 - 3 * p2 + p3) * mu ** 3
+    )
+
+
+def douglas_peucker(points, tolerance):
+    """Downsample a curve with the Douglas-Peucker algorithm.
+
+    Args:
+        points (array): Points [[x1, x2, x3], ...] along the curve.
+        tolerance (float): Maximum allowed distance of the removed points
+            from the simplified curve.
+
+    Returns:
+        array: Boolean mask of the points that are kept.
+    """
+    points = np.asarray(points, dtype=float)
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        segment = points[last] - points[first]
+        vectors = points[first + 1 : last] - points[first]
+        length = np.linalg.norm(segment)
+        if length == 0:
+            distances = np.linalg.norm(vectors, axis=1)
+        else:
+            # distance to the segment, clipped at its end points
+            t = np.clip(vectors @ segment / length ** 2, 0, 1)
+            distances = np.linalg.norm(vectors - t[:, None] * segment, axis=1)
+        i = np.argmax(distances)
+        if distances[i] > tolerance:
+            keep[first + 1 + i] = True
+            stack.append((first, first + 1 + i))
+            stack.append((first + 1 + i, last))
+    return keep
+
 
 class Patch:
     """Patch to define boundaries."""
@@ -742,12 +2135,152 @@ class Patch:
         self.faces.append(face)
 
 
+@dataclass
+class EdgeDeviation:
+    """Discretization error of a curved edge, see Edge.discretization_error."""
+
+    edge: "Edge"
+    cells: int
+    absolute: float
+    relative: float
+
+
+@dataclass
+class Statistics:
+    """Size of the mesh as generated by blockMesh. patches contains the
+    number of faces per patch, faces that are not assigned to a patch end
+    up in defaultFaces. memory is a rough estimate in bytes."""
+
+    cells: int
+    points: int
+    internal_faces: int
+    boundary_faces: int
+    patches: dict
+    default_faces: int
+    memory: float
+    regions: dict = None
+
+
+@dataclass
+class BoundaryLayer:
+    """Boundary layer(s) computed by solve_boundary_layer. All attributes are
+    arrays with the broadcast shape of the input parameters."""
+
+    block_size: np.ndarray
+    smallest_element: np.ndarray
+    growth_rate: np.ndarray
+    layer_thickness: np.ndarray
+    largest_element: np.ndarray
+    cells_layer: np.ndarray
+    cells_outside: np.ndarray
+    cells: np.ndarray
+
+    @property
+    def valid(self):
+        """False where the boundary layer does not fit into the block."""
+        return (self.cells_layer > 0) & (self.cells_outside > 0)
+
+    def grading(self, pos="xmin"):
+        """Grading string(s) for blockMesh.
+
+        Args:
+            pos (str): Coordinate position of the boundary layer, xmin or xmax.
+
+        Returns:
+            str or array of str
+        """
+        if pos not in ["xmin", "xmax"]:
+            raise ValueError(
+                f"Position '{pos}'' not defined. Use either 'xmin' or 'xmax'"
+            )
+        gradings = np.empty(self.cells.shape, dtype=object)
+        for i in np.ndindex(self.cells.shape):
+            block_size = self.block_size[i].item()
+            layer_thickness = self.layer_thickness[i].item()
+            growth_rate = self.growth_rate[i].item()
+            n_el_bl = self.cells_layer[i].item()
+            n_el_out = self.cells_outside[i].item()
+            if pos == "xmin":
+                gradings[i] = f"( ({layer_thickness / block_size} {n_el_bl} {growth_rate**(n_el_bl-1)}) ({(block_size-layer_thickness)/block_size} {n_el_out} 1) )"
+            else:
+                gradings[i] = f"( ({(block_size-layer_thickness)/block_size} {n_el_out} 1) ({layer_thickness/block_size} {n_el_bl} {1/growth_rate**(n_el_bl-1)}) )"
+        if gradings.ndim == 0:
+            return gradings.item()
+        return gradings
+
+
+def solve_boundary_layer(
+    block_size,
+    smallest_element=0.0003,
+    layer_thickness=0.007,
+    growth_rate=1.2,
+):
+    """Compute boundary layers for arrays of parameters at once, e.g. to scan
+    over first cell sizes and growth rates. The parameters are broadcast
+    against each other.
+
+    Args:
+        block_size (float or array): length of block in direction of BL
+        smallest_element (float or array): Minimum element size (preserved)
+        layer_thickness (float or array): Thickness of BL (modified to match
+            number of elements).
+        growth_rate (float or array): Growth rate of element size in BL.
+
+    Returns:
+        BoundaryLayer object.
+    """
+    block_size, smallest_element, layer_thickness, growth_rate = np.broadcast_arrays(
+        *[
+            np.asarray(x, dtype=float)
+            for x in [block_size, smallest_element, layer_thickness, growth_rate]
+        ]
+    )
+    growth_rate = np.where(growth_rate < 1, 1 / growth_rate, growth_rate)
+    uniform = growth_rate == 1
+    # avoid division by zero for uniform layers, these are treated separately
+    rate = np.where(uniform, 2, growth_rate)
+    with np.errstate(invalid="ignore"):
+        # compute number of elements in boundary layer
+        n_el_bl = np.where(
+            uniform,
+            np.ceil(layer_thickness / smallest_element),
+            np.ceil(
+                np.log(1 - layer_thickness * (1 - rate) / smallest_element)
+                / np.log(rate)
+            ),
+        )
+    n_el_bl = np.nan_to_num(n_el_bl).astype(int)
+    # update layer thickness to match rounded number of elements
+    layer_thickness = np.where(
+        uniform,
+        smallest_element * n_el_bl,
+        smallest_element * (1 - rate ** n_el_bl) / (1 - rate),
+    )
+    # maximum element size
+    largest_element = np.where(
+        uniform, smallest_element, smallest_element * rate ** (n_el_bl - 1)
+    )
+    # number of elements outside of boundary layer
+    n_el_out = np.trunc((block_size - layer_thickness) / largest_element).astype(int)
+    return BoundaryLayer(
+        block_size,
+        smallest_element,
+        growth_rate,
+        layer_thickness,
+        largest_element,
+        n_el_bl,
+        n_el_out,
+        n_el_bl + n_el_out,
+    )
+
+
 def boundary_layer(
     block_size,
     pos="xmin",
     smallest_element=0.0003,
     layer_thickness=0.007,
     growth_rate=1.2,
+    verbose=True,
 ):
     """Compute boundary layer
 
@@ -757,48 +2290,196 @@ def boundary_layer(
         smallest_element (float): Minimum element size (preserved)
         layer_thickness (float): Thickness of BL (modified to match number of elements).
         growth_rate (float): Growth rate of element size in BL.
+        verbose (bool): Print information about the boundary layer.
 
     Returns:
         number of elements, grading-string
     """
-    if growth_rate < 1:
-        growth_rate = 1 / growth_rate
-    # compute number of elements in boundary layer
-    if growth_rate == 1:
-        n_el_bl = int(np.ceil(layer_thickness / smallest_element))
-    else:
-        n_el_bl = int(
-            np.ceil(
-                np.log(1 - layer_thickness * (1 - growth_rate) / smallest_element)
-                / np.log(growth_rate)
+    bl = solve_boundary_layer(
+        block_size, smallest_element, layer_thickness, growth_rate
+    )
+    grading = bl.grading(pos)
+    if verbose:
+        print("Elements in BL:", bl.cells_layer.item())
+        print("Elements outside:", bl.cells_outside.item())
+        print("Layer thickness:", bl.layer_thickness.item())
+        print("Larges Element:", bl.largest_element.item())
+    if not bl.valid:
+        raise ValueError("Impossible grading!")
+    return bl.cells.item(), grading
+
+
+def boundary_layers(block_size, layers, verbose=False):
+    """Compute multi-segment grading with several boundary layers, e.g. at
+    both ends of a block. The space between the layers is filled with
+    uniform elements of the size of the largest adjacent layer element.
+
+    Args:
+        block_size (float): length of block in direction of BL
+        layers (list): Boundary layers as tuples (pos, smallest_element,
+            layer_thickness, growth_rate). pos is "xmin", "xmax" or the
+            coordinate of an interior layer, that grows to both sides.
+        verbose (bool, optional): Print information about the segments.
+
+    Returns:
+        number of elements, grading-string
+    """
+    if len(layers) == 0:
+        raise ValueError("At least one boundary layer is required.")
+    coordinates = []
+    for layer in layers:
+        if layer[0] == "xmin":
+            coordinates.append(0)
+        elif layer[0] == "xmax":
+            coordinates.append(block_size)
+        elif isinstance(layer[0], str):
+            raise ValueError(
+                f"Position '{layer[0]}' not defined. Use 'xmin', 'xmax' or a coordinate."
             )
+        else:
+            coordinates.append(layer[0])
+    order = np.argsort(coordinates, kind="stable")
+    coordinates = np.array(coordinates, dtype=float)[order]
+    bl = solve_boundary_layer(
+        block_size, *np.array([layer[1:] for layer in layers], dtype=float)[order].T
+    )
+    # segments as [start, end, cells, expansion, size of largest element]
+    segments = []
+    for i, x in enumerate(coordinates):
+        n_el_bl = bl.cells_layer[i].item()
+        thickness = bl.layer_thickness[i].item()
+        expansion = bl.growth_rate[i].item() ** (n_el_bl - 1)
+        largest_element = bl.largest_element[i].item()
+        if x > 0:  # layer growing towards xmin
+            segments.append([x - thickness, x, n_el_bl, 1 / expansion, largest_element])
+        if x < block_size:  # layer growing towards xmax
+            segments.append([x, x + thickness, n_el_bl, expansion, largest_element])
+    # fill gaps with uniform elements
+    grading = []
+    n_el = 0
+    x = 0
+    for i, segment in enumerate(segments + [[block_size, block_size, 0, 1, 0]]):
+        gap = segment[0] - x
+        if i == 0:
+            element_size = segment[4]
+        elif i == len(segments):
+            element_size = segments[-1][4]
+        else:
+            element_size = max(segments[i - 1][4], segment[4])
+        if gap < 0:
+            raise ValueError("Impossible grading! Boundary layers overlap.")
+        if gap > 0:
+            # gaps smaller than an element get a single element
+            n_el_gap = max(1, round(gap / element_size))
+            grading.append(f"({gap / block_size} {n_el_gap} 1)")
+            n_el += n_el_gap
+            if verbose:
+                print(f"Uniform segment: {n_el_gap} elements, size {gap / n_el_gap}")
+        if i < len(segments):
+            grading.append(
+                f"({(segment[1] - segment[0]) / block_size} {segment[2]} {segment[3]})"
+            )
+            n_el += segment[2]
+            if verbose:
+                print(
+                    f"Boundary layer: {segment[2]} elements, thickness {segment[1] - segment[0]}"
+                )
+        x = segment[1]
+    return n_el, f"( {' '.join(grading)} )"
+
+
+def estimate_boundary_layer(
+    length,
+    y_plus=1,
+    reynolds=None,
+    velocity=None,
+    viscosity=None,
+    prandtl=None,
+    grashof=None,
+    cells_in_layer=10,
+    max_growth_rate=1.2,
+    verbose=False,
+):
+    """Estimate boundary layer parameters from flow parameters using flat plate
+    correlations. The first cell height follows from the target y+ (forced
+    flow), the growth rate is chosen such that the thinnest of the velocity
+    and thermal boundary layers is resolved with cells_in_layer elements.
+
+    Args:
+        length (float): Characteristic length (e.g. length of the wall).
+        y_plus (float, optional): Target y+ of the first cell.
+        reynolds (float, optional): Reynolds number. Alternatively, provide
+            velocity and viscosity.
+        velocity (float, optional): Free stream velocity.
+        viscosity (float, optional): Kinematic viscosity.
+        prandtl (float, optional): Prandtl number, required for the thermal
+            boundary layer.
+        grashof (float, optional): Grashof number for natural convection.
+        cells_in_layer (int, optional): Minimum number of elements in the
+            thinnest boundary layer.
+        max_growth_rate (float, optional): Upper limit for the growth rate.
+        verbose (bool, optional): Print information about the boundary layer.
+
+    Returns:
+        smallest_element, layer_thickness, growth_rate (as used by
+        boundary_layer)
+    """
+    if reynolds is None and velocity is not None:
+        if viscosity is None:
+            raise ValueError("Viscosity is required to compute the Reynolds number.")
+        reynolds = velocity * length / viscosity
+    if grashof is not None and prandtl is None:
+        raise ValueError("Prandtl number is required for natural convection.")
+    if reynolds is None and grashof is None:
+        raise ValueError("Provide either reynolds, velocity and viscosity or grashof.")
+
+    thickness = []
+    smallest_element = np.inf
+    if reynolds is not None:
+        if reynolds < 5e5:  # laminar
+            delta = 5.0 * length / reynolds ** 0.5
+            skin_friction = 0.664 / reynolds ** 0.5
+        else:  # turbulent
+            delta = 0.37 * length / reynolds ** 0.2
+            skin_friction = 0.0592 / reynolds ** 0.2
+        thickness.append(delta)
+        smallest_element = y_plus * length / (reynolds * (skin_friction / 2) ** 0.5)
+        if prandtl is not None:
+            thickness.append(delta / prandtl ** (1 / 3))
+    if grashof is not None:
+        rayleigh = grashof * prandtl
+        if rayleigh < 1e9:
+            nusselt = 0.59 * rayleigh ** 0.25
+        else:
+            nusselt = 0.1 * rayleigh ** (1 / 3)
+        thickness.append(length / nusselt)
+    layer_thickness = max(thickness)
+    delta_min = min(thickness)
+
+    def layer(growth_rate):
+        # thickness of cells_in_layer elements starting with smallest_element
+        if growth_rate == 1:
+            return smallest_element * cells_in_layer
+        return smallest_element * (growth_rate ** cells_in_layer - 1) / (growth_rate - 1)
+
+    if not np.isfinite(smallest_element):
+        # no y+ criterion, resolve the boundary layer with the maximum growth rate
+        growth_rate = max_growth_rate
+        smallest_element = (
+            delta_min * (growth_rate - 1) / (growth_rate ** cells_in_layer - 1)
         )
-    # update layer thickness to match rounded number of elements
-    if growth_rate == 1:
-        layer_thickness = smallest_element * n_el_bl
+    elif layer(1) >= delta_min:
+        # y+ is not decisive, refine to resolve the boundary layer
+        growth_rate = 1
+        smallest_element = delta_min / cells_in_layer
+    elif layer(max_growth_rate) <= delta_min:
+        growth_rate = max_growth_rate
     else:
-        layer_thickness = (
-            smallest_element * (1 - growth_rate ** n_el_bl) / (1 - growth_rate)
+        growth_rate = optimize.brentq(
+            lambda g: layer(g) - delta_min, 1, max_growth_rate
         )
-    # maximum element size
-    if growth_rate == 1:
-        largest_element = smallest_element
-    else:
-        largest_element = smallest_element * growth_rate ** (n_el_bl - 1)
-    # number of elements outside of boundary layer
-    n_el_out = int((block_size - layer_thickness) / largest_element)
-    n_el = n_el_bl + n_el_out
-
-    if pos == "xmin":
-        grading = f"( ({layer_thickness / block_size} {n_el_bl} {growth_rate**(n_el_bl-1)}) ({(block_size-layer_thickness)/block_size} {n_el_out} 1) )"
-    elif pos == "xmax":
-        grading = f"( ({(block_size-layer_thickness)/block_size} {n_el_out} 1) ({layer_thickness/block_size} {n_el_bl} {1/growth_rate**(n_el_bl-1)}) )"
-    else:
-        raise ValueError(f"Position '{pos}'' not defined. Use either 'xmin' or 'xmax'")
-    print("Elements in BL:", n_el_bl)
-    print("Elements outside:", n_el_out)
-    print("Layer thickness:", layer_thickness)
-    print("Larges Element:", largest_element)
-    if n_el_out <= 0 or n_el_bl <= 0:
-        raise ValueError("Impossible grading!")
-    return n_el, grading
+    if verbose:
+        print("Boundary layer thickness:", thickness)
+        print("Smallest element:", smallest_element)
+        print("Growth rate:", growth_rate)
+    return smallest_element, layer_thickness, growth_rate
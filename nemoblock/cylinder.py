@@ -1,6 +1,7 @@
-import matplotlib.pyplot as plt
 import numpy as np
-from dataclasses import dataclass
+from collections import OrderedDict, namedtuple
+from dataclasses import dataclass, field
+import hashlib
 import scipy.interpolate as interpolate
 
 from .blocks import *
@@ -8,18 +9,29 @@ from .blocks import *
 
 @dataclass
 class Ring:
-    """Ring object to build meshes."""
+    """Ring object to build meshes. The blocks are the sectors of the ring,
+    phi contains the angles of the sector boundaries in degree. Rings that
+    do not cover 360° have cut faces at the first (surf_front) and last
+    (surf_back) angle."""
 
     blocks: list
     surf_top: list
     surf_bt: list
     surf_rad: list
+    phi: list = None
+    surf_front: list = field(default_factory=list)
+    surf_back: list = field(default_factory=list)
     _grading_r: str = "1"
     _grading_z: str = "1"
 
+    def __post_init__(self):
+        if self.phi is None:
+            n = len(self.blocks)
+            self.phi = [360 * i / n for i in range(n + 1)]
+
     def _update_grading(self):
         for b in self.blocks:
-            b.grading = f"simpleGrading ({self._grading_r} 1 {self._grading_z})"
+            b.grading = Grading.simple(self._grading_r, 1, self._grading_z)
 
     def set_grading_radial(self, val):
         self._grading_r = val
@@ -29,6 +41,62 @@ class Ring:
         self._grading_z = val
         self._update_grading()
 
+    def set_cell_size(self, val):
+        """Set the target cell size of the blocks, see
+        Mesh.compute_number_of_cells. It overrides mesh.cell_size, which
+        must be set when passing 0 as number of cells to create_ring.
+        Explicit numbers of cells are kept.
+
+        Args:
+            val (float or callable): Target cell size.
+        """
+        _check_cell_size(self.blocks)
+        for b in self.blocks:
+            b.cell_size = val
+
+    def set_first_cell_size(self, direction, size, pos="xmin"):
+        """Grade the edges of all blocks such that the cells at xmin or xmax
+        have the given size, see Block.set_first_cell_size. This is
+        overwritten by set_grading_radial / set_grading_axial.
+
+        Args:
+            direction (str): radial or axial
+            size (float): Size of the first cell.
+            pos (str, optional): Position of the first cell, xmin (inside /
+                bottom) or xmax (outside / top).
+        """
+        if direction not in ["radial", "axial"]:
+            raise ValueError(
+                f"Direction '{direction}' not defined. Use 'radial' or 'axial'."
+            )
+        for b in self.blocks:
+            b.set_first_cell_size("x1" if direction == "radial" else "x3", size, pos)
+
+    def transfer(self, mesh, pos, memo=None):
+        """Copy the top, bottom or side surface of this ring into another
+        mesh to create a conformal interface, see Block.transfer. The
+        returned ring can be used as ring_below / ring_on_top.
+
+        Args:
+            mesh (Mesh): Mesh to copy the surface to.
+            pos (str): Surface to copy: top, bottom, side
+            memo (dict, optional): Points and edges already transferred.
+
+        Returns:
+            Ring object.
+        """
+        faces = {"top": "top", "bottom": "bottom", "side": "right"}
+        if pos not in faces:
+            raise ValueError(
+                "This position does not exists. Allowable parameters for pos are 'bottom', 'top', 'side'."
+            )
+        if memo is None:
+            memo = {}
+        blocks = [b.transfer(mesh, faces[pos], memo) for b in self.blocks]
+        surf = {"top": [], "bottom": [], "side": []}
+        surf[pos] = [getattr(b, f"face_{faces[pos]}") for b in blocks]
+        return Ring(blocks, surf["top"], surf["bottom"], surf["side"], list(self.phi))
+
     def set_spline_surface(self, spline, pos, res=100):
         # set surface with spline z=f(r)
 
@@ -38,80 +106,65 @@ class Ring:
         # if type(z_top) is interp1d:
         #     z_top_out = z_top(r_top)
 
+        # points and edge at the first / last angle of each block
         if pos == "bottom":
-            r_in = (self.blocks[0]._p0.x1 ** 2 + self.blocks[0]._p0.x2 ** 2) ** 0.5
-            r_out = (self.blocks[0]._p1.x1 ** 2 + self.blocks[0]._p1.x2 ** 2) ** 0.5
-            self.blocks[0].p0.update_coordinates(cartesian(r_in, 0, spline(r_in)))
-            self.blocks[1].p0.update_coordinates(cartesian(r_in, 90, spline(r_in)))
-            self.blocks[2].p0.update_coordinates(cartesian(r_in, 180, spline(r_in)))
-            self.blocks[3].p0.update_coordinates(cartesian(r_in, 270, spline(r_in)))
-            self.blocks[0].p1.update_coordinates(cartesian(r_out, 0, spline(r_out)))
-            self.blocks[1].p1.update_coordinates(cartesian(r_out, 90, spline(r_out)))
-            self.blocks[2].p1.update_coordinates(cartesian(r_out, 180, spline(r_out)))
-            self.blocks[3].p1.update_coordinates(cartesian(r_out, 270, spline(r_out)))
-            for b in self.blocks:
-                b.e0.type = "spline"
-            for r in np.linspace(r_in, r_out, res, endpoint=False):
-                self.blocks[0].e0.points.append(cartesian(r, 0, spline(r)))
-                self.blocks[1].e0.points.append(cartesian(r, 90, spline(r)))
-                self.blocks[2].e0.points.append(cartesian(r, 180, spline(r)))
-                self.blocks[3].e0.points.append(cartesian(r, 270, spline(r)))
+            start = ["p0", "p1", "e0"]
+            end = ["p3", "p2", "e1"]
         elif pos == "top":
-            r_in = (self.blocks[0]._p4.x1 ** 2 + self.blocks[0]._p4.x2 ** 2) ** 0.5
-            r_out = (self.blocks[0]._p5.x1 ** 2 + self.blocks[0]._p5.x2 ** 2) ** 0.5
-            self.blocks[0].p4.update_coordinates(cartesian(r_in, 0, spline(r_in)))
-            self.blocks[1].p4.update_coordinates(cartesian(r_in, 90, spline(r_in)))
-            self.blocks[2].p4.update_coordinates(cartesian(r_in, 180, spline(r_in)))
-            self.blocks[3].p4.update_coordinates(cartesian(r_in, 270, spline(r_in)))
-            self.blocks[0].p5.update_coordinates(cartesian(r_out, 0, spline(r_out)))
-            self.blocks[1].p5.update_coordinates(cartesian(r_out, 90, spline(r_out)))
-            self.blocks[2].p5.update_coordinates(cartesian(r_out, 180, spline(r_out)))
-            self.blocks[3].p5.update_coordinates(cartesian(r_out, 270, spline(r_out)))
-            for b in self.blocks:
-                b.e3.type = "spline"
-            for r in np.linspace(r_in, r_out, res, endpoint=False):
-                self.blocks[0].e3.points.append(cartesian(r, 0, spline(r)))
-                self.blocks[1].e3.points.append(cartesian(r, 90, spline(r)))
-                self.blocks[2].e3.points.append(cartesian(r, 180, spline(r)))
-                self.blocks[3].e3.points.append(cartesian(r, 270, spline(r)))
+            start = ["p4", "p5", "e3"]
+            end = ["p7", "p6", "e2"]
         elif pos == "side":
-            r_bt = (self.blocks[0]._p1.x1 ** 2 + self.blocks[0]._p1.x2 ** 2) ** 0.5
-            r_top = (self.blocks[0]._p5.x1 ** 2 + self.blocks[0]._p5.x2 ** 2) ** 0.5
-            self.blocks[0].p1.update_coordinates(cartesian(r_bt, 0, spline(r_bt)))
-            self.blocks[1].p1.update_coordinates(cartesian(r_bt, 90, spline(r_bt)))
-            self.blocks[2].p1.update_coordinates(cartesian(r_bt, 180, spline(r_bt)))
-            self.blocks[3].p1.update_coordinates(cartesian(r_bt, 270, spline(r_bt)))
-            self.blocks[0].p5.update_coordinates(cartesian(r_top, 0, spline(r_top)))
-            self.blocks[1].p5.update_coordinates(cartesian(r_top, 90, spline(r_top)))
-            self.blocks[2].p5.update_coordinates(cartesian(r_top, 180, spline(r_top)))
-            self.blocks[3].p5.update_coordinates(cartesian(r_top, 270, spline(r_top)))
-            for b in self.blocks:
-                b.e9.type = "spline"
-            for r in np.linspace(r_bt, r_top, res):
-                self.blocks[0].e9.points.append(cartesian(r, 0, spline(r)))
-                self.blocks[1].e9.points.append(cartesian(r, 90, spline(r)))
-                self.blocks[2].e9.points.append(cartesian(r, 180, spline(r)))
-                self.blocks[3].e9.points.append(cartesian(r, 270, spline(r)))
+            start = ["p1", "p5", "e9"]
+            end = ["p2", "p6", "e10"]
         else:
             raise ValueError(
                 "This position does not exists. Allowable parameters for pos are 'bottom', 'top', 'side'."
             )
+        p = getattr(self.blocks[0], start[0])
+        r_0 = (p.x1 ** 2 + p.x2 ** 2) ** 0.5
+        p = getattr(self.blocks[0], start[1])
+        r_1 = (p.x1 ** 2 + p.x2 ** 2) ** 0.5
+        if pos == "side":
+            r = np.linspace(r_0, r_1, res)
+        else:
+            r = np.linspace(r_0, r_1, res, endpoint=False)
+
+        boundaries = [(b, phi, start) for b, phi in zip(self.blocks, self.phi)]
+        if self.phi[-1] - self.phi[0] < 360:
+            boundaries.append((self.blocks[-1], self.phi[-1], end))
+        for b, phi, (p0, p1, e) in boundaries:
+            getattr(b, p0).update_coordinates(cartesian(r_0, phi, spline(r_0)))
+            getattr(b, p1).update_coordinates(cartesian(r_1, phi, spline(r_1)))
+            e = getattr(b, e)
+            e.type = "spline"
+            e.points += _circle(r, phi, spline(r))
 
 
 @dataclass
 class Cylinder:
-    """Cylinder object to build meshes."""
+    """Cylinder object to build meshes. The core is a square block or,
+    for more than four sectors, a polygon made of several blocks
+    (core_blocks). Cylinders that do not cover 360° have cut faces at the
+    first (surf_front) and last (surf_back) angle."""
 
     core: Block
     ring: Ring
     surf_top: list
     surf_bt: list
     surf_rad: list
+    core_blocks: list = None
+    surf_front: list = field(default_factory=list)
+    surf_back: list = field(default_factory=list)
     _grading_r: str = "1"
     _grading_z: str = "1"
 
+    def __post_init__(self):
+        if self.core_blocks is None:
+            self.core_blocks = [self.core]
+
     def _update_grading(self):
-        self.core.grading = f"simpleGrading (1 1 {self._grading_z})"
+        for b in self.core_blocks:
+            b.grading = Grading.simple(1, 1, self._grading_z)
         self.ring.set_grading_radial(self._grading_r)
         self.ring.set_grading_axial(self._grading_z)
 
@@ -123,91 +176,74 @@ class Cylinder:
         self._grading_z = val
         self._update_grading()
 
+    def set_cell_size(self, val):
+        """Set the target cell size of the blocks, see
+        Mesh.compute_number_of_cells. It overrides mesh.cell_size, which
+        must be set when passing 0 as number of cells to create_cylinder.
+        Explicit numbers of cells are kept.
+
+        Args:
+            val (float or callable): Target cell size.
+        """
+        _check_cell_size(self.core_blocks + self.ring.blocks)
+        for b in self.core_blocks + self.ring.blocks:
+            b.cell_size = val
+
+    def set_first_cell_size(self, direction, size, pos="xmin"):
+        """Grade the edges of all blocks such that the cells at xmin or xmax
+        have the given size, see Block.set_first_cell_size. In radial
+        direction, only the ring is graded. This is overwritten by
+        set_grading_radial / set_grading_axial.
+
+        Args:
+            direction (str): radial or axial
+            size (float): Size of the first cell.
+            pos (str, optional): Position of the first cell, xmin (inside /
+                bottom) or xmax (outside / top).
+        """
+        if direction == "axial":
+            for b in self.core_blocks:
+                b.set_first_cell_size("x3", size, pos)
+        self.ring.set_first_cell_size(direction, size, pos)
+
+    def transfer(self, mesh, pos):
+        """Copy the top or bottom surface of this cylinder into another
+        mesh to create a conformal interface, see Block.transfer. The
+        returned cylinder can be used as cylinder_below / cylinder_on_top.
+
+        Args:
+            mesh (Mesh): Mesh to copy the surface to.
+            pos (str): Surface to copy: top, bottom
+
+        Returns:
+            Cylinder object.
+        """
+        if pos not in ["top", "bottom"]:
+            raise ValueError(
+                "This position does not exists. Allowable parameters for pos are 'bottom', 'top'."
+            )
+        memo = {}
+        core_blocks = [b.transfer(mesh, pos, memo) for b in self.core_blocks]
+        ring = self.ring.transfer(mesh, pos, memo)
+        surf = [getattr(b, f"face_{pos}") for b in core_blocks]
+        if pos == "top":
+            surf_top = surf + ring.surf_top
+            surf_bt = []
+        else:
+            surf_top = []
+            surf_bt = surf + ring.surf_bt
+        return Cylinder(core_blocks[0], ring, surf_top, surf_bt, [], core_blocks)
+
     def set_spline_surface(self, spline, pos, res=100):
-        # set surface with spline z=f(r)
+        # set surface with spline z=f(r), polygon cores (more than four
+        # sectors) have a point on the axis and require spline(0)
 
         if pos == "bottom":
-            # update core
-            radius_center_bt = (self.core._p1.x1 ** 2 + self.core._p1.x2 ** 2) ** 0.5
-            z_bt_mid = spline(radius_center_bt)
-            # update points
-            self.core.p0.update_coordinates(cartesian(radius_center_bt, 0, z_bt_mid))
-            self.core.p1.update_coordinates(cartesian(radius_center_bt, 90, z_bt_mid))
-            self.core.p2.update_coordinates(cartesian(radius_center_bt, 180, z_bt_mid))
-            self.core.p3.update_coordinates(cartesian(radius_center_bt, 270, z_bt_mid))
-            # set values on edges
-            x0 = np.array(cartesian(radius_center_bt, 0, z_bt_mid))
-            x1 = np.array(cartesian(radius_center_bt, 90, z_bt_mid))
-            radii = []
-            phis = []
-            for dist in np.linspace(0, 1, res, endpoint=False):
-                pos = x0 + dist * (x1 - x0)
-                radii.append((pos[0] ** 2 + pos[1] ** 2) ** 0.5)
-                phis.append(np.arctan(pos[1] / pos[0]) * 360 / (2 * np.pi))
-            z_vals = spline(radii)
-            self.core.e0.type = "spline"
-            self.core.e5.type = "spline"
-            self.core.e1.type = "spline"
-            self.core.e4.type = "spline"
-            for i in range(len(radii) - 1):
-                self.core.e0.points.append(
-                    cartesian(radii[i + 1], phis[i + 1], z_vals[i + 1])
-                )
-                self.core.e5.points.append(
-                    cartesian(radii[i + 1], phis[i + 1] + 90, z_vals[i + 1])
-                )
-                self.core.e1.points.append(
-                    cartesian(radii[i + 1], 270 - phis[i + 1], z_vals[i + 1])
-                )
-                self.core.e4.points.append(
-                    cartesian(radii[i + 1], 360 - phis[i + 1], z_vals[i + 1])
-                )
-            self.ring.set_spline_surface(spline, "bottom", res)
-
+            points = ["p0", "p1", "p2", "p3"]
+            edges = ["e0", "e5", "e1", "e4"]
         elif pos == "top":
-            # update core
-            radius_center_top = (self.core._p5.x1 ** 2 + self.core._p5.x2 ** 2) ** 0.5
-            z_top_mid = spline(radius_center_top)
-            # update points
-            self.core.p4.update_coordinates(cartesian(radius_center_top, 0, z_top_mid))
-            self.core.p5.update_coordinates(cartesian(radius_center_top, 90, z_top_mid))
-            self.core.p6.update_coordinates(
-                cartesian(radius_center_top, 180, z_top_mid)
-            )
-            self.core.p7.update_coordinates(
-                cartesian(radius_center_top, 270, z_top_mid)
-            )
-            # set values on edges
-            x0 = np.array(cartesian(radius_center_top, 0, z_top_mid))
-            x1 = np.array(cartesian(radius_center_top, 90, z_top_mid))
-            radii = []
-            phis = []
-            for dist in np.linspace(0, 1, res, endpoint=False):
-                pos = x0 + dist * (x1 - x0)
-                radii.append((pos[0] ** 2 + pos[1] ** 2) ** 0.5)
-                phis.append(np.arctan(pos[1] / pos[0]) * 360 / (2 * np.pi))
-            z_vals = spline(radii)
-
-            self.core.e3.type = "spline"
-            self.core.e6.type = "spline"
-            self.core.e2.type = "spline"
-            self.core.e7.type = "spline"
-
-            for i in range(len(radii) - 1):
-                self.core.e3.points.append(
-                    cartesian(radii[i + 1], phis[i + 1], z_vals[i + 1])
-                )
-                self.core.e6.points.append(
-                    cartesian(radii[i + 1], phis[i + 1] + 90, z_vals[i + 1])
-                )
-                self.core.e2.points.append(
-                    cartesian(radii[i + 1], 270 - phis[i + 1], z_vals[i + 1])
-                )
-                self.core.e7.points.append(
-                    cartesian(radii[i + 1], 360 - phis[i + 1], z_vals[i + 1])
-                )
-            self.ring.set_spline_surface(spline, "top", res)
-
+            points = ["p4", "p5", "p6", "p7"]
+            edges = ["e3", "e6", "e2", "e7"]
         elif pos == "side":
             raise NotImplementedError()
         else:
@@ -215,6 +251,38 @@ class Cylinder:
                 "This position does not exists. Allowable parameters for pos are 'bottom', 'top', 'side'."
             )
 
+        if len(self.core_blocks) > 1:
+            try:
+                spline(0)
+            except ValueError:
+                raise ValueError(
+                    "The spline must be defined on the axis (r = 0) for "
+                    "cylinders with more than four sectors."
+                )
+        # update core points
+        for b in self.core_blocks:
+            for name in points:
+                p = getattr(b, name)
+                radius = (p.x1 ** 2 + p.x2 ** 2) ** 0.5
+                p.update_coordinates([p.x1, p.x2, float(spline(radius))])
+        # set values on edges, edges shared by two core blocks only once
+        dist = np.linspace(0, 1, res, endpoint=False)[1:, None]
+        done = set()
+        for b in self.core_blocks:
+            for name in edges:
+                e = getattr(b, name)
+                key = frozenset([id(e.p0), id(e.p1)])
+                if e.p0 is e.p1 or key in done:
+                    continue
+                done.add(key)
+                x0 = np.array([e.p0.x1, e.p0.x2])
+                x1 = np.array([e.p1.x1, e.p1.x2])
+                xy = x0 + dist * (x1 - x0)
+                z_vals = spline((xy ** 2).sum(axis=1) ** 0.5)
+                e.type = "spline"
+                e.points = np.column_stack([xy, z_vals]).tolist()
+        self.ring.set_spline_surface(spline, pos, res)
+
 
 def cartesian(r, phi, z, degree=True):
     """Convert cylindrical to cartesian coordinates.
@@ -235,46 +303,234 @@ def cartesian(r, phi, z, degree=True):
     return [x, y, z]
 
 
+def _circle(r, phi, z):
+    """Vectorized version of cartesian.
+
+    Args:
+        r (float or array): Radius.
+        phi (float or array): Angle in degree.
+        z (float or array): Axial coordinate.
+
+    Returns:
+        list of cartesian coordinates [[x, y, z], ...]
+    """
+    phi = np.asarray(phi, dtype=float)
+    return np.column_stack(np.broadcast_arrays(*cartesian(r, phi, z))).tolist()
+
+
+def _check_core_sectors(sectors):
+    """The blocks of a polygon core degenerate with many sectors, their
+    corners at the ring have an angle of 180° - 360° / sectors."""
+    if sectors < 4 or sectors % 2 != 0:
+        raise ValueError("The number of sectors must be even and at least 4.")
+    if sectors > 8:
+        raise ValueError(
+            f"Cylinders support 4, 6 or 8 sectors, not {sectors}: the core "
+            "blocks degenerate for more sectors. Use create_ring around a "
+            "custom core for finer rings."
+        )
+
+
+def _check_cell_size(blocks):
+    """A cell size has no effect on blocks with explicit numbers of cells
+    in all directions."""
+    for b in blocks:
+        cells = [b._cells_x1, b._cells_x2, b._cells_x3]
+        for axis in range(3):
+            if cells[axis] == 0 or (id(b), axis) in b.mesh._auto_cells:
+                return
+    raise ValueError(
+        "The cell size has no effect, all numbers of cells were set explicitly. "
+        "Pass 0 as number of cells to compute it from the cell size."
+    )
+
+
+def _sector_cells(res_phi, sectors):
+    """Number of cells in circumferential direction per sector."""
+    if res_phi % sectors != 0:
+        raise ValueError(
+            f"res_phi = {res_phi} is not divisible by the number of sectors ({sectors})."
+        )
+    return int(res_phi // sectors)
+
+
+SplineCacheInfo = namedtuple(
+    "SplineCacheInfo", ["hits", "misses", "maxsize", "currsize"]
+)
+
+_spline_cache = OrderedDict()
+_spline_cache_maxsize = 128
+_spline_cache_hits = 0
+_spline_cache_misses = 0
+
+
 def spline(points, kind="cubic"):
-    """Create a spline functions
+    """Create a spline functions. Splines are cached: identical control
+    points and kind return the same interpolator.
 
     Args:
         points (list): list of [r, z] coordinates
         kind (str, optional): spline type (linear / cubic)
     """
-    points = np.array(points)
-    return interpolate.interp1d(points[:, 0], points[:, 1], kind=kind)
+    global _spline_cache_hits, _spline_cache_misses
+    points = np.ascontiguousarray(points, dtype=float)
+    key = (
+        hashlib.sha1(points.tobytes()).hexdigest(),
+        points.shape,
+        kind,
+    )
+    if key in _spline_cache:
+        _spline_cache_hits += 1
+        _spline_cache.move_to_end(key)
+        return _spline_cache[key]
+    _spline_cache_misses += 1
+    sp = interpolate.interp1d(points[:, 0], points[:, 1], kind=kind)
+    if _spline_cache_maxsize > 0:
+        _spline_cache[key] = sp
+        while len(_spline_cache) > _spline_cache_maxsize:
+            _spline_cache.popitem(last=False)
+    return sp
+
+
+def spline_cache_info():
+    """Statistics of the spline cache.
+
+    Returns:
+        SplineCacheInfo: hits, misses, maxsize, currsize
+    """
+    return SplineCacheInfo(
+        _spline_cache_hits,
+        _spline_cache_misses,
+        _spline_cache_maxsize,
+        len(_spline_cache),
+    )
+
+
+def set_spline_cache_size(maxsize):
+    """Set the maximum number of cached splines.
+
+    Args:
+        maxsize (int): Maximum number of splines. 0 disables caching.
+    """
+    global _spline_cache_maxsize
+    if maxsize < 0:
+        raise ValueError("The cache size must not be negative.")
+    _spline_cache_maxsize = maxsize
+    while len(_spline_cache) > _spline_cache_maxsize:
+        _spline_cache.popitem(last=False)
+
+
+def clear_spline_cache():
+    """Remove all splines from the cache and reset the statistics."""
+    global _spline_cache_hits, _spline_cache_misses
+    _spline_cache.clear()
+    _spline_cache_hits = 0
+    _spline_cache_misses = 0
+
+
+class BSplineCurve:
+    """Cubic B-spline curve [x(t), y(t)] with the parameter t in [0, 1]."""
+
+    def __init__(self, control_points, res=1000):
+        """Create a B-spline curve from control points.
+
+        Args:
+            control_points (list): list of points [[x0, y0], [x1, y1], ...]
+            res (int, optional): Number of samples used to invert x(t).
+        """
+        self.control_points = np.array(control_points, dtype=float)
+        t = np.concatenate(
+            [[0, 0, 0], np.linspace(0, 1, self.control_points.shape[0] - 2), [1, 1, 1]]
+        )  # knots
+        self.spline = interpolate.BSpline(t, self.control_points, 3)
+        self._derivative = self.spline.derivative()
+        self._res = res
+        self._x_table = None
+        self._t_table = None
+
+    def __call__(self, t):
+        """Evaluate the curve.
+
+        Args:
+            t (float or array): Parameter value(s) in [0, 1].
+
+        Returns:
+            array: [x coordinates, y coordinates]
+        """
+        return self.spline(t).T
+
+    def y_of_x(self, x, iterations=4):
+        """Evaluate the curve as function y = f(x), e.g. z = f(r) for
+        set_spline_surface. Requires x(t) to be monotonic.
+
+        Args:
+            x (float or array): x coordinate(s).
+            iterations (int, optional): Newton iterations to refine t.
+
+        Returns:
+            float or array: y coordinate(s).
+        """
+        if self._x_table is None:
+            t_table = np.linspace(0, 1, self._res)
+            x_table = self.spline(t_table)[:, 0]
+            if np.all(np.diff(x_table) < 0):
+                t_table = t_table[::-1]
+                x_table = x_table[::-1]
+            elif not np.all(np.diff(x_table) > 0):
+                raise ValueError("x(t) is not monotonic, the curve can't be inverted.")
+            self._t_table = t_table
+            self._x_table = x_table
+        x = np.asarray(x, dtype=float)
+        t = np.interp(x, self._x_table, self._t_table)
+        for _ in range(iterations):
+            dx_dt = self._derivative(t)[..., 0]
+            step = np.divide(
+                self.spline(t)[..., 0] - x,
+                dx_dt,
+                out=np.zeros_like(t),
+                where=dx_dt != 0,
+            )
+            t = np.clip(t - step, 0, 1)
+        y = self.spline(t)[..., 1]
+        if y.ndim == 0:
+            return float(y)
+        return y
 
 
 # inspired by https://github.com/kawache/Python-B-spline-examples
-def b_spline(control_points, plot=False, res=100):
+def b_spline(control_points, plot=False, res=100, as_curve=False):
     """Create a spline curve that does not go through the control points.
 
     Args:
         control_points (list): list of points [[x0, y0], [x1, y1], ...]
         plot (bool): Plot the spline and the control points
         res (int): Resolution. Defaults to 100.
+        as_curve (bool): Return a BSplineCurve that can be evaluated at
+            arbitrary parameters instead of sampled points.
 
     Returns:
-        array: [x coordinates, y coordinates]
+        array: [x coordinates, y coordinates] or BSplineCurve
     """
-    control_points = np.array(control_points)
-    t = np.concatenate(
-        [[0, 0, 0], np.linspace(0, 1, control_points.shape[0] - 2), [1, 1, 1]]
-    )  # knots
-
-    spline = interpolate.splev(np.linspace(0, 1, res), [t, control_points.T, 3])
+    curve = BSplineCurve(control_points)
+    spline = curve(np.linspace(0, 1, res))
 
     if plot:
+        import matplotlib.pyplot as plt
+
         fig, ax = plt.subplots(1, 1)
         ax.plot(spline[0], spline[1], label="b-spline curve")
         ax.plot(
-            control_points[:, 0], control_points[:, 1], "x--", label="control points"
+            curve.control_points[:, 0],
+            curve.control_points[:, 1],
+            "x--",
+            label="control points",
         )
         ax.legend()
         ax.grid(linestyle=":")
         plt.show()
-    return np.array(spline)
+    if as_curve:
+        return curve
+    return spline
 
 
 def plot_spline(sp, r, fig=None, ax=None):
@@ -289,6 +545,8 @@ def plot_spline(sp, r, fig=None, ax=None):
     Returns:
         matplotlib figure, axis
     """
+    import matplotlib.pyplot as plt
+
     if fig is None:
         fig, ax = plt.subplots(1, 1)
     r = np.linspace(r[0], r[1], 100)
@@ -306,8 +564,13 @@ def create_cylinder(
     radius_ratio=0.5,
     cylinder_below=None,
     cylinder_on_top=None,
+    sectors=None,
+    wedge_angle=None,
+    angle=360,
 ):
-    """Create a cylinder object consisting of a square core surrounded by a ring.
+    """Create a cylinder object consisting of a core surrounded by a ring.
+    With 4 sectors the core is a square block, with more sectors it is a
+    polygon made of sectors / 2 blocks meeting at the axis.
 
     Args:
         mesh (Mesh): Mesh containing the blocks.
@@ -315,52 +578,127 @@ def create_cylinder(
         p_bt (list): [r, z] coordinate at bottom
         res_r (float): Number of cells in radial direction (in Ring).
         res_phi (float): Number of cells in circumferential direction.
-        res_z (float): Number of cells in axial direction.
+        res_z (float): Number of cells in axial direction. Numbers of cells
+            passed as 0 are computed from the cell size when writing, this
+            requires mesh.cell_size to be set (see Cylinder.set_cell_size).
         radius_ratio (float, optional): Fraction inner square / total radius.
         cylinder_below (Cylinder, optional): Cylinder object below this cylinder.
         cylinder_on_top (Cylinder, optional): Cylinder object on top of this cylinder.
+        sectors (int, optional): Number of sectors of the ring in the full
+            circle, 4, 6 or 8 (more sectors would degenerate the core
+            blocks). res_phi must be divisible by it. Defaults to 4, or 8 if
+            angle is smaller than 360.
+        wedge_angle (float, optional): Create a single wedge with this
+            opening angle in degree for axisymmetric meshes. The core is
+            collapsed at the axis and has res_phi / (2 * sectors) cells in
+            radial direction. Its front and back faces are added to the
+            patches "wedge front" and "wedge back".
+        angle (float, optional): Build only a sector of the cylinder from
+            0° to this angle, e.g. 90 or 180 for symmetric cases. res_phi
+            and sectors still refer to the full circle, the cut faces are
+            collected in surf_front (0°) and surf_back.
 
     Returns:
         Cylinder object.
     """
     if cylinder_below is not None and cylinder_on_top is not None:
         raise ValueError("Both cylinder on top and below is not supported.")
-
-    # Central block
+    if wedge_angle is not None and angle != 360:
+        raise ValueError("Wedges and sectors cannot be combined.")
+    if sectors is None:
+        sectors = 4 if angle == 360 else 8
+    if wedge_angle is None:
+        _check_core_sectors(sectors)
+    elif sectors < 4 or sectors % 2 != 0:
+        raise ValueError("The number of sectors must be even and at least 4.")
+
+    # Central blocks
     radius_center_top = p_top[0] * radius_ratio
     radius_center_bt = p_bt[0] * radius_ratio
-    res_center_r = int(round(res_phi / 4))
+    if wedge_angle is not None:
+        # single block, collapsed at the axis (p3 = p0, p7 = p4)
+        phi = [-wedge_angle / 2, wedge_angle / 2]
+        corners_bt = [[0, 0, p_bt[1]]] + _circle(radius_center_bt, phi, p_bt[1])
+        corners_top = [[0, 0, p_top[1]]] + _circle(radius_center_top, phi, p_top[1])
+        corners_bt.append("p0")
+        corners_top.append("p4")
+        quads = [[0, 1, 2, 3]]
+        res_core = [max(1, int(round(res_phi / sectors / 2))), 1]
+    else:
+        n = sectors * angle / 360  # number of sectors within angle
+        if angle != 360 and (sectors < 8 or n % 2 != 0):
+            raise ValueError(
+                "Sectors of cylinders require at least 8 sectors in the full circle "
+                "and an even number of sectors within the angle."
+            )
+        n = int(n)
+        res_sector = _sector_cells(res_phi, sectors)
+        if angle == 360:
+            phi = 360 * np.arange(sectors) / sectors
+        else:
+            phi = 360 * np.arange(n + 1) / sectors
+        corners_bt = _circle(radius_center_bt, phi, p_bt[1]) + [[0, 0, p_bt[1]]]
+        corners_top = _circle(radius_center_top, phi, p_top[1]) + [[0, 0, p_top[1]]]
+        if sectors == 4:
+            quads = [[0, 1, 2, 3]]
+        else:
+            # polygon split into quadrilaterals with a common point on the axis
+            quads = [
+                [2 * i, 2 * i + 1, (2 * i + 2) % len(phi), len(phi)]
+                for i in range(n // 2)
+            ]
+        res_core = [res_sector, res_sector]
+    for other in [cylinder_below, cylinder_on_top]:
+        if other is not None and len(other.core_blocks) != len(quads):
+            raise ValueError(
+                "The connected cylinder has a different number of sectors."
+            )
 
-    if cylinder_below is not None:
-        b = Block(mesh)
-        b.set_connection(cylinder_below.core, "bottom")
-        b.p4 = cartesian(radius_center_top, 0, p_top[1])
-        b.p5 = cartesian(radius_center_top, 90, p_top[1])
-        b.p6 = cartesian(radius_center_top, 180, p_top[1])
-        b.p7 = cartesian(radius_center_top, 270, p_top[1])
-    elif cylinder_on_top is not None:
+    core_blocks = []
+    for i, quad in enumerate(quads):
         b = Block(mesh)
-        b.set_connection(cylinder_on_top.core, "top")
-        b.p0 = cartesian(radius_center_bt, 0, p_bt[1])
-        b.p1 = cartesian(radius_center_bt, 90, p_bt[1])
-        b.p2 = cartesian(radius_center_bt, 180, p_bt[1])
-        b.p3 = cartesian(radius_center_bt, 270, p_bt[1])
-    else:
-        b = Block(
-            mesh,
-            cartesian(radius_center_bt, 0, p_bt[1]),
-            cartesian(radius_center_bt, 90, p_bt[1]),
-            cartesian(radius_center_bt, 180, p_bt[1]),
-            cartesian(radius_center_bt, 270, p_bt[1]),
-            cartesian(radius_center_top, 0, p_top[1]),
-            cartesian(radius_center_top, 90, p_top[1]),
-            cartesian(radius_center_top, 180, p_top[1]),
-            cartesian(radius_center_top, 270, p_top[1]),
-        )
-    b.set_number_of_cells(res_center_r, res_center_r, res_z)
-    b.create()
+        if cylinder_below is not None:
+            b.set_connection(cylinder_below.core_blocks[i], "bottom")
+        elif cylinder_on_top is not None:
+            b.set_connection(cylinder_on_top.core_blocks[i], "top")
+        if i > 0:
+            b.face_left = core_blocks[i - 1].face_back
+        if i > 0 and i == len(quads) - 1 and angle == 360:
+            b.face_back = core_blocks[0].face_left
+        for name, j in zip(["p0", "p1", "p2", "p3"], quad):
+            if getattr(b, name) is None:
+                setattr(b, name, corners_bt[j])
+        for name, j in zip(["p4", "p5", "p6", "p7"], quad):
+            if getattr(b, name) is None:
+                setattr(b, name, corners_top[j])
+        if cylinder_below is None and cylinder_on_top is None:
+            b.set_number_of_cells(res_core[0], res_core[1], res_z)
+        else:
+            b.cells_x3 = res_z  # the others are derived from the connected block
+        b.create()
+        core_blocks.append(b)
 
     # create ring around these blocks
+    if wedge_angle is not None:
+        faces_inside = [core_blocks[0].face_right]
+        surf_front = [core_blocks[0].face_front]
+        surf_back = [core_blocks[0].face_back]
+        mesh.get_patch("wedge front").faces += surf_front
+        mesh.get_patch("wedge back").faces += surf_back
+    elif sectors == 4:
+        b = core_blocks[0]
+        faces_inside = [b.face_front, b.face_right, b.face_back, b.face_left]
+        surf_front = []
+        surf_back = []
+    else:
+        faces_inside = []
+        for b in core_blocks:
+            faces_inside += [b.face_front, b.face_right]
+        surf_front = []
+        surf_back = []
+        if angle != 360:
+            surf_front.append(core_blocks[0].face_left)
+            surf_back.append(core_blocks[-1].face_back)
     ring_below = None
     ring_on_top = None
     if cylinder_below is not None:
@@ -371,17 +709,28 @@ def create_cylinder(
         mesh,
         p_top,
         p_bt,
-        [b.face_front, b.face_right, b.face_back, b.face_left],
+        faces_inside,
         res_r,
         res_phi,
         res_z,
         ring_below=ring_below,
         ring_on_top=ring_on_top,
+        wedge_angle=wedge_angle,
+        angle=angle,
+    )
+    surf_top = [b.face_top for b in core_blocks] + ring.surf_top
+    surf_bt = [b.face_bottom for b in core_blocks] + ring.surf_bt
+
+    return Cylinder(
+        core_blocks[0],
+        ring,
+        surf_top,
+        surf_bt,
+        ring.surf_rad,
+        core_blocks,
+        surf_front + ring.surf_front,
+        surf_back + ring.surf_back,
     )
-    surf_top = [b.face_top] + ring.surf_top
-    surf_bt = [b.face_bottom] + ring.surf_bt
-
-    return Cylinder(b, ring, surf_top, surf_bt, ring.surf_rad)
 
 
 def create_ring(
@@ -395,8 +744,10 @@ def create_ring(
     ring_below=None,
     ring_on_top=None,
     faces_outside=[],
+    wedge_angle=None,
+    angle=360,
 ):
-    """Create a ring of 4 blocks.
+    """Create a ring of blocks, one sector for each of the faces inside.
 
     Args:
         mesh (Mesh): Mesh object containing the blocks.
@@ -405,10 +756,20 @@ def create_ring(
         faces_inside (list): Faces of blocks inside of the ring.
         res_r (float): Number of cells in radial direction.
         res_phi (float): Number of cells in circumferential direction.
-        res_z (float): Number of cells in axial direction.
+        res_z (float): Number of cells in axial direction. Numbers of cells
+            passed as 0 are computed from the cell size when writing, this
+            requires mesh.cell_size to be set (see Ring.set_cell_size).
         ring_below (Ring, optional): Ring object bellow this ring.
         ring_on_top (Ring, optional): Ring object on top of this ring.
         faces_outside (list, optional): Surfaces of blocks outside of this ring.
+        wedge_angle (float, optional): Create a single wedge sector with
+            this opening angle in degree for axisymmetric meshes (one
+            face inside, res_phi is ignored). Its front and back faces are
+            added to the patches "wedge front" and "wedge back".
+        angle (float, optional): Build only a sector of the ring from 0° to
+            this angle, e.g. 90 or 180 for symmetric cases. res_phi refers
+            to the full circle, the cut faces are collected in surf_front
+            (0°) and surf_back.
 
     Returns:
         Ring object.
@@ -416,99 +777,66 @@ def create_ring(
 
     if ring_below is not None and ring_on_top is not None:
         raise ValueError("It's not allowed to provide both ring_on_top and ring_below.")
+    if wedge_angle is not None and angle != 360:
+        raise ValueError("Wedges and sectors cannot be combined.")
+    if not 0 < angle <= 360:
+        raise ValueError("The angle must be in (0, 360].")
+    sectors = len(faces_inside)
+    if wedge_angle is not None:
+        if sectors != 1:
+            raise ValueError("A wedge requires exactly one face inside.")
+        res_sector = 1
+        phi = np.array([-wedge_angle / 2, wedge_angle / 2])
+    else:
+        res_sector = _sector_cells(res_phi * angle / 360, sectors)
+        phi = angle * np.arange(sectors + 1) / sectors
+    for other in [ring_below, ring_on_top]:
+        if other is not None and len(other.blocks) != sectors:
+            raise ValueError("The connected ring has a different number of sectors.")
+    closed = phi[-1] - phi[0] >= 360
+
+    phi_mid = (phi[:-1] + phi[1:]) / 2
+    points_bt = _circle(p_bt[0], phi, p_bt[1])
+    points_top = _circle(p_top[0], phi, p_top[1])
+    arcs_bt = _circle(p_bt[0], phi_mid, p_bt[1])
+    arcs_top = _circle(p_top[0], phi_mid, p_top[1])
 
     blocks = []
-
-    b = Block(mesh)
-    b.face_left = faces_inside[0]
-    if faces_outside != []:
-        b.face_right = faces_outside[0]
-        b.set_number_of_cells(res_r, int(round(res_phi / 4)), res_z)
-        b.create()
-    elif ring_below is not None:
-        b.set_connection(ring_below.blocks[0], "bottom")
-        b.p5 = cartesian(p_top[0], 0, p_top[1])
-        b.p6 = cartesian(p_top[0], 90, p_top[1])
-        b.set_number_of_cells(res_r, int(round(res_phi / 4)), res_z)
-        b.create()
-        b.e6.type = "arc"
-        b.e6.points = [cartesian(p_top[0], 45, p_top[1])]
-    elif ring_on_top is not None:
-        b.set_connection(ring_on_top.blocks[0], "top")
-        b.p1 = cartesian(p_bt[0], 0, p_bt[1])
-        b.p2 = cartesian(p_bt[0], 90, p_bt[1])
-        b.set_number_of_cells(res_r, int(round(res_phi / 4)), res_z)
-        b.create()
-        b.e5.type = "arc"
-        b.e5.points = [cartesian(p_bt[0], 45, p_bt[1])]
-    else:
-        b.p1 = cartesian(p_bt[0], 0, p_bt[1])
-        b.p2 = cartesian(p_bt[0], 90, p_bt[1])
-        b.p5 = cartesian(p_top[0], 0, p_top[1])
-        b.p6 = cartesian(p_top[0], 90, p_top[1])
-        b.set_number_of_cells(res_r, int(round(res_phi / 4)), res_z)
-        b.create()
-        b.e5.type = "arc"
-        b.e5.points = [cartesian(p_bt[0], 45, p_bt[1])]
-        b.e6.type = "arc"
-        b.e6.points = [cartesian(p_top[0], 45, p_top[1])]
-    blocks.append(b)
-
-    for i in range(2):
-        i += 1
+    for i in range(sectors):
         b = Block(mesh)
         b.face_left = faces_inside[i]
-        b.face_front = blocks[i - 1].face_back
+        if i > 0:
+            b.face_front = blocks[i - 1].face_back
+        if i == sectors - 1 and closed:
+            b.face_back = blocks[0].face_front
         if faces_outside != []:
             b.face_right = faces_outside[i]
-            b.set_number_of_cells(res_r, int(round(res_phi / 4)), res_z)
-            b.create()
         elif ring_below is not None:
             b.set_connection(ring_below.blocks[i], "bottom")
-            b.p6 = cartesian(p_top[0], 90 * (i + 1), p_top[1])
-            b.set_number_of_cells(res_r, int(round(res_phi / 4)), res_z)
-            b.create()
-            b.e6.type = "arc"
-            b.e6.points = [cartesian(p_top[0], i * 90 + 45, p_top[1])]
         elif ring_on_top is not None:
             b.set_connection(ring_on_top.blocks[i], "top")
-            b.p2 = cartesian(p_bt[0], 90 * (i + 1), p_bt[1])
-            b.set_number_of_cells(res_r, int(round(res_phi / 4)), res_z)
-            b.create()
-            b.e5.type = "arc"
-            b.e5.points = [cartesian(p_bt[0], i * 90 + 45, p_bt[1])]
+        if b.p1 is None:
+            b.p1 = points_bt[i]
+        if b.p2 is None:
+            b.p2 = points_bt[i + 1]
+        if b.p5 is None:
+            b.p5 = points_top[i]
+        if b.p6 is None:
+            b.p6 = points_top[i + 1]
+        if faces_outside == [] and (ring_below is not None or ring_on_top is not None):
+            b.cells_x3 = res_z  # the others are derived from the connected block
         else:
-            b.p2 = cartesian(p_bt[0], 90 * (i + 1), p_bt[1])
-            b.p6 = cartesian(p_top[0], 90 * (i + 1), p_top[1])
-            b.set_number_of_cells(res_r, int(round(res_phi / 4)), res_z)
-            b.create()
-            b.e5.type = "arc"
-            b.e5.points = [cartesian(p_bt[0], i * 90 + 45, p_bt[1])]
-            b.e6.type = "arc"
-            b.e6.points = [cartesian(p_top[0], i * 90 + 45, p_top[1])]
+            b.set_number_of_cells(res_r, res_sector, res_z)
+        b.create()
+        if faces_outside == []:
+            if ring_below is None:
+                b.e5.type = "arc"
+                b.e5.points = [arcs_bt[i]]
+            if ring_on_top is None:
+                b.e6.type = "arc"
+                b.e6.points = [arcs_top[i]]
         blocks.append(b)
 
-    b = Block(mesh)
-    b.face_left = faces_inside[-1]
-    b.face_front = blocks[-1].face_back
-    b.face_back = blocks[0].face_front
-    b.set_number_of_cells(res_r, int(round(res_phi / 4)), res_z)
-    b.create()
-    if faces_outside != []:
-        pass
-    elif ring_below is not None:
-        b.e6.type = "arc"
-        b.e6.points = [cartesian(p_top[0], 360 - 45, p_top[1])]
-    elif ring_on_top is not None:
-        b.e5.type = "arc"
-        b.e5.points = [cartesian(p_bt[0], 360 - 45, p_bt[1])]
-    else:
-        b.e5.type = "arc"
-        b.e5.points = [cartesian(p_bt[0], 360 - 45, p_bt[1])]
-        b.e6.type = "arc"
-        b.e6.points = [cartesian(p_top[0], 360 - 45, p_top[1])]
-    blocks.append(b)
-
     surf_top = []
     surf_bt = []
     surf_rad = []
@@ -516,5 +844,132 @@ def create_ring(
         surf_top.append(b.face_top)
         surf_bt.append(b.face_bottom)
         surf_rad.append(b.face_right)
+    surf_front = []
+    surf_back = []
+    if not closed:
+        surf_front.append(blocks[0].face_front)
+        surf_back.append(blocks[-1].face_back)
+    if wedge_angle is not None:
+        mesh.get_patch("wedge front").faces += surf_front
+        mesh.get_patch("wedge back").faces += surf_back
+
+    return Ring(
+        blocks, surf_top, surf_bt, surf_rad, phi.tolist(), surf_front, surf_back
+    )
 
-    return Ring(blocks, surf_top, surf_bt, surf_rad)
+
+def create_cylinder_stack(
+    mesh, z, r, res_r, res_phi, res_z, radius_ratio=0.5, sectors=4
+):
+    """Create axially stacked cylinders in one pass. Neighboring cylinders
+    share the vertices and edges at their interface.
+
+    Args:
+        mesh (Mesh): Mesh containing the blocks.
+        z (list): Axial coordinates of the n + 1 interfaces, bottom to top.
+        r (float or list): Radius at each of the interfaces.
+        res_r (float): Number of cells in radial direction (in Ring).
+        res_phi (float): Number of cells in circumferential direction.
+        res_z (float or list): Number of cells in axial direction of each
+            of the n cylinders.
+        radius_ratio (float, optional): Fraction inner square / total radius.
+        sectors (int, optional): Number of sectors of the rings, 4, 6 or
+            8, see create_cylinder.
+
+    Returns:
+        list of Cylinder objects, bottom to top.
+    """
+    z = np.asarray(z, dtype=float)
+    if z.ndim != 1 or len(z) < 2:
+        raise ValueError("At least two axial coordinates are required.")
+    _check_core_sectors(sectors)
+    r = np.broadcast_to(np.asarray(r, dtype=float), z.shape)
+    res_z = np.broadcast_to(res_z, (len(z) - 1,))
+    res_sector = _sector_cells(res_phi, sectors)
+
+    # coordinates of all levels, shape (levels, sectors, 3)
+    phi = 360 * np.arange(sectors) / sectors
+    phi_mid = phi + 180 / sectors
+    core = np.stack(
+        np.broadcast_arrays(*cartesian(radius_ratio * r[:, None], phi, z[:, None])), -1
+    )
+    if sectors > 4:
+        # common point of the core blocks on the axis
+        axis = np.stack([0 * z, 0 * z, z], -1)[:, None]
+        core = np.concatenate([core, axis], axis=1)
+    outer = np.stack(np.broadcast_arrays(*cartesian(r[:, None], phi, z[:, None])), -1)
+    arcs = np.stack(
+        np.broadcast_arrays(*cartesian(r[:, None], phi_mid, z[:, None])), -1
+    )
+    core_points = [[mesh._add_point(*x) for x in level] for level in core.tolist()]
+    outer_points = [[mesh._add_point(*x) for x in level] for level in outer.tolist()]
+
+    if sectors == 4:
+        quads = [[0, 1, 2, 3]]
+    else:
+        quads = [
+            [2 * i, 2 * i + 1, (2 * i + 2) % sectors, sectors]
+            for i in range(sectors // 2)
+        ]
+
+    cylinders = []
+    for level in range(len(z) - 1):
+        below = cylinders[-1] if cylinders != [] else None
+        bt = core_points[level]
+        top = core_points[level + 1]
+        core_blocks = []
+        for i, quad in enumerate(quads):
+            b = Block(mesh)
+            if below is not None:
+                b.set_connection(below.core_blocks[i], "bottom")
+            else:
+                b.p0, b.p1, b.p2, b.p3 = [bt[j] for j in quad]
+            b.p4, b.p5, b.p6, b.p7 = [top[j] for j in quad]
+            b.set_number_of_cells(res_sector, res_sector, res_z[level])
+            b.create()
+            core_blocks.append(b)
+
+        blocks = []
+        for i in range(sectors):
+            j = (i + 1) % sectors
+            b = Block(mesh)
+            if below is not None:
+                b.set_connection(below.ring.blocks[i], "bottom")
+            else:
+                b.p0 = bt[i]
+                b.p1 = outer_points[level][i]
+                b.p2 = outer_points[level][j]
+                b.p3 = bt[j]
+            b.p4 = top[i]
+            b.p5 = outer_points[level + 1][i]
+            b.p6 = outer_points[level + 1][j]
+            b.p7 = top[j]
+            b.set_number_of_cells(res_r, res_sector, res_z[level])
+            b.create()
+            if below is None:
+                b.e5.type = "arc"
+                b.e5.points = [arcs[level, i].tolist()]
+            b.e6.type = "arc"
+            b.e6.points = [arcs[level + 1, i].tolist()]
+            blocks.append(b)
+
+        ring = Ring(
+            blocks,
+            [b.face_top for b in blocks],
+            [b.face_bottom for b in blocks],
+            [b.face_right for b in blocks],
+            (360 * np.arange(sectors + 1) / sectors).tolist(),
+        )
+        surf_top = [b.face_top for b in core_blocks] + ring.surf_top
+        surf_bt = [b.face_bottom for b in core_blocks] + ring.surf_bt
+        cylinders.append(
+            Cylinder(
+                core_blocks[0],
+                ring,
+                surf_top,
+                surf_bt,
+                ring.surf_rad,
+                core_blocks,
+            )
+        )
+    return cylinders
@@ -0,0 +1,99 @@
+"""Areas, volumes and centroids of quadrilaterals and hexahedra, vectorized
+over arbitrary leading dimensions. The corners are given either directly or
+as points with connectivity (face_areas, cell_volumes)."""
+import numpy as np
+
+# faces of a hexahedron p0 to p7 with outward normals
+_HEX_FACES = [
+    (0, 3, 2, 1),
+    (4, 5, 6, 7),
+    (0, 4, 7, 3),
+    (1, 2, 6, 5),
+    (0, 1, 5, 4),
+    (3, 7, 6, 2),
+]
+
+
+def _triangles(points):
+    """Triangles between the center and the edges of polygons."""
+    center = points.mean(axis=-2, keepdims=True)
+    a = points - center
+    b = np.roll(points, -1, axis=-2) - center
+    area = 0.5 * np.cross(a, b)
+    centroid = center + (a + b) / 3
+    return area, centroid
+
+
+def quad_areas(points):
+    """Area vectors and centroids of (possibly non-planar) quadrilaterals,
+    which are split into four triangles around the center.
+
+    Args:
+        points (np.array): Corners of shape (..., 4, 3).
+
+    Returns:
+        tuple: Area vectors (..., 3) and centroids (..., 3).
+    """
+    points = np.asarray(points, dtype=float)
+    area, centroid = _triangles(points)
+    weight = np.linalg.norm(area, axis=-1)
+    total = weight.sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        centroid = (weight[..., None] * centroid).sum(axis=-2) / total[..., None]
+    centroid = np.where(total[..., None] > 0, centroid, points.mean(axis=-2))
+    return area.sum(axis=-2), centroid
+
+
+def hex_volumes(corners):
+    """Volumes and centroids of hexahedra, which are split into pyramids
+    between the center and the faces. Collapsed points are allowed.
+
+    Args:
+        corners (np.array): Points p0 to p7 of shape (..., 8, 3).
+
+    Returns:
+        tuple: Volumes (...) and centroids (..., 3).
+    """
+    corners = np.asarray(corners, dtype=float)
+    center = corners.mean(axis=-2)
+    faces = corners[..., _HEX_FACES, :]
+    area, centroid = _triangles(faces)
+    center = center[..., None, None, :]
+    volume = np.einsum("...i,...i", area, centroid - center) / 3
+    total = volume.sum(axis=(-1, -2))
+    tet_centroid = (center + 3 * centroid) / 4
+    with np.errstate(divide="ignore", invalid="ignore"):
+        centroid = (volume[..., None] * tet_centroid).sum(axis=(-2, -3))
+        centroid /= total[..., None]
+    centroid = np.where(total[..., None] != 0, centroid, corners.mean(axis=-2))
+    return total, centroid
+
+
+def face_areas(points, faces):
+    """Area vectors and centroids of quadrilaterals given by connectivity,
+    see quad_areas.
+
+    Args:
+        points (np.array): Points of shape (n, 3).
+        faces (np.array): Point indices of the corners, shape (m, 4).
+
+    Returns:
+        tuple: Area vectors (m, 3) and centroids (m, 3).
+    """
+    points = np.asarray(points, dtype=float)
+    return quad_areas(points[np.asarray(faces, dtype=int)])
+
+
+def cell_volumes(points, cells):
+    """Volumes and centroids of hexahedra given by connectivity, e.g. the
+    cells of a mesh, see hex_volumes.
+
+    Args:
+        points (np.array): Points of shape (n, 3).
+        cells (np.array): Point indices of the corners p0 to p7, shape (m, 8).
+
+    Returns:
+        tuple: Volumes (m) and centroids (m, 3).
+    """
+    points = np.asarray(points, dtype=float)
+    return hex_volumes(points[np.asarray(cells, dtype=int)])
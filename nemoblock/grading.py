@@ -0,0 +1,362 @@
+"""Grading of blocks following the simpleGrading / edgeGrading syntax of
+blockMesh, including multi-grading with several segments per direction."""
+import re
+from dataclasses import dataclass
+import numpy as np
+import scipy.optimize as optimize
+
+
+def _tokenize(string):
+    return re.findall(r"\(|\)|[^\s()]+", string)
+
+
+def _parse_tokens(tokens):
+    """Convert tokens of a grading string into nested lists."""
+    values = []
+    while tokens:
+        token = tokens.pop(0)
+        if token == "(":
+            values.append(_parse_tokens(tokens))
+        elif token == ")":
+            return values
+        else:
+            values.append(_number(token))
+    return values
+
+
+def _number(value):
+    if isinstance(value, str):
+        if re.fullmatch(r"[+-]?\d+", value):
+            return int(value)
+        return float(value)
+    return value
+
+
+def _expansion_ratio(ratio, m, m_refined):
+    """Expansion ratio of a segment with m cells refined to m_refined cells,
+    the smallest cell is scaled with m / m_refined."""
+    if ratio == 1 or m <= 1 or m_refined <= 1:
+        return ratio
+    if ratio < 1:
+        return 1 / _expansion_ratio(1 / ratio, m, m_refined)
+    # q is the logarithm of the growth rate per cell
+    q = np.log(ratio) / (m - 1)
+    length = np.expm1(q * m) / np.expm1(q) * m_refined / m
+
+    def residual(x):
+        return np.expm1(x * m_refined) / np.expm1(x) - length
+
+    q_max = q
+    while residual(q_max) < 0:
+        q_max *= 2
+    q = optimize.brentq(residual, 1e-12, q_max)
+    return float(np.exp(q * (m_refined - 1)))
+
+
+def _growth_rate(cells, length):
+    """Growth rate of the cell size such that cells starting with size 1
+    sum up to length. A single cell always fills the edge."""
+    if cells <= 1:
+        return 1.0
+    if length <= 1:
+        raise ValueError("The first cell is larger than the edge.")
+
+    def residual(q):
+        if q == 0:
+            return cells - length
+        return np.expm1(q * cells) / np.expm1(q) - length
+
+    low, high = -1.0, 1.0
+    while residual(low) > 0:
+        low *= 2
+    while residual(high) < 0:
+        high *= 2
+    return float(np.exp(optimize.brentq(residual, low, high)))
+
+
+@dataclass
+class Expansion:
+    """Grading in one direction or along one edge. It consists of segments
+    [length fraction, cell fraction, expansion ratio], a simple expansion
+    ratio is a single segment [1, 1, ratio]."""
+
+    segments: list
+
+    @classmethod
+    def parse(cls, value):
+        """Create an expansion from a number, a string or a list of segments.
+
+        Args:
+            value (float, str or list): E.g. 4, "( (0.2 0.3 4) (0.8 0.7 1) )"
+                or [[0.2, 0.3, 4], [0.8, 0.7, 1]].
+
+        Returns:
+            Expansion object.
+        """
+        if isinstance(value, Expansion):
+            return value
+        if isinstance(value, str):
+            value = _parse_tokens(_tokenize(value))
+            if len(value) != 1:
+                raise ValueError(f"Invalid expansion '{value}'.")
+            value = value[0]
+        if isinstance(value, (list, tuple)):
+            segments = [[_number(x) for x in segment] for segment in value]
+            if len(segments) == 0 or any(len(s) != 3 for s in segments):
+                raise ValueError(
+                    "Segments must be given as (length fraction, cell fraction, expansion ratio)."
+                )
+            return cls(segments)
+        return cls([[1, 1, _number(value)]])
+
+    @classmethod
+    def from_first_cell(cls, length, cells, first_cell, pos="xmin"):
+        """Create an expansion with a given size of the first cell.
+
+        Args:
+            length (float): Length of the edge.
+            cells (int): Number of cells.
+            first_cell (float): Size of the cell at pos.
+            pos (str, optional): Position of the first cell, xmin (start of
+                the edge) or xmax (end of the edge).
+
+        Returns:
+            Expansion object.
+        """
+        if pos not in ["xmin", "xmax"]:
+            raise ValueError(
+                f"Position '{pos}'' not defined. Use either 'xmin' or 'xmax'"
+            )
+        ratio = _growth_rate(cells, length / first_cell) ** (cells - 1)
+        if pos == "xmax":
+            ratio = 1 / ratio
+        return cls([[1, 1, ratio]])
+
+    def __str__(self):
+        if len(self.segments) == 1:
+            return str(self.segments[0][2])
+        segments = " ".join(f"({a} {b} {c})" for a, b, c in self.segments)
+        return f"( {segments} )"
+
+    @property
+    def uniform(self):
+        """True if all cells have the same size."""
+        return all(segment[2] == 1 for segment in self.segments) and (
+            len(self.segments) == 1
+            or np.allclose(
+                [s[0] / s[1] for s in self.segments],
+                self.segments[0][0] / self.segments[0][1],
+            )
+        )
+
+    def reverse(self):
+        """Expansion in opposite direction.
+
+        Returns:
+            Expansion object.
+        """
+        return Expansion([[a, b, 1 / c] for a, b, c in self.segments[::-1]])
+
+    def isclose(self, other, rtol=1e-9):
+        """Check if two expansions result in the same node distribution.
+
+        Args:
+            other (Expansion): Expansion to compare with.
+            rtol (float, optional): Relative tolerance.
+
+        Returns:
+            bool
+        """
+        if self.uniform and other.uniform:
+            return True
+        if len(self.segments) != len(other.segments):
+            return False
+        a = np.array(self.segments, dtype=float)
+        b = np.array(other.segments, dtype=float)
+        a[:, :2] /= a[:, :2].sum(axis=0)
+        b[:, :2] /= b[:, :2].sum(axis=0)
+        return np.allclose(a, b, rtol=rtol, atol=0)
+
+    def segment_cells(self, n):
+        """Number of cells of the segments for a total of n cells, rounded
+        as in blockMesh.
+
+        Args:
+            n (int): Total number of cells.
+
+        Returns:
+            list of int
+        """
+        total = sum(segment[1] for segment in self.segments)
+        cells = []
+        for segment in self.segments[:-1]:
+            cells.append(int(segment[1] / total * n + 0.5))
+        cells.append(int(n) - sum(cells))
+        return cells
+
+    def nodes(self, n):
+        """Relative position of the nodes.
+
+        Args:
+            n (int): Number of cells.
+
+        Returns:
+            np.array: n + 1 node positions from 0 to 1.
+        """
+        total = sum(segment[0] for segment in self.segments)
+        nodes = [np.zeros(1)]
+        start = 0
+        for segment, m in zip(self.segments, self.segment_cells(n)):
+            length = segment[0] / total
+            if m > 0:
+                ratio = segment[2]
+                if ratio == 1 or m == 1:
+                    x = np.arange(1, m + 1) / m
+                else:
+                    r = ratio ** (1 / (m - 1))
+                    x = (1 - r ** np.arange(1, m + 1)) / (1 - r ** m)
+                nodes.append(start + length * x)
+            start += length
+        return np.concatenate(nodes)
+
+    def cell_sizes(self, n, length=1):
+        """Size of the cells.
+
+        Args:
+            n (int): Number of cells.
+            length (float, optional): Length of the edge.
+
+        Returns:
+            np.array: n cell sizes.
+        """
+        return np.diff(self.nodes(n)) * length
+
+    def refine(self, n, n_refined):
+        """Adapt the expansion to a refined number of cells, the smallest
+        cell of each segment is scaled with n / n_refined.
+
+        Args:
+            n (int): Number of cells.
+            n_refined (int): Refined number of cells.
+
+        Returns:
+            Expansion object.
+        """
+        if len(self.segments) == 1:
+            ratio = self.segments[0][2]
+            return Expansion([[1, 1, _expansion_ratio(ratio, n, n_refined)]])
+        cells = self.segment_cells(n_refined)
+        if n_refined >= len(cells):
+            # at least one cell per segment, taken from the largest segment
+            for k in range(len(cells)):
+                while cells[k] < 1:
+                    cells[int(np.argmax(cells))] -= 1
+                    cells[k] += 1
+        segments = []
+        for segment, m, m_refined in zip(self.segments, self.segment_cells(n), cells):
+            ratio = _expansion_ratio(segment[2], m, m_refined)
+            segments.append([segment[0], m_refined, ratio])
+        return Expansion(segments)
+
+
+@dataclass
+class Grading:
+    """Grading of a block, either simpleGrading with expansions in x1, x2
+    and x3 direction or edgeGrading with expansions for the edges e0 to
+    e11."""
+
+    expansions: list
+    kind: str = "simpleGrading"
+
+    def __post_init__(self):
+        self.expansions = [Expansion.parse(x) for x in self.expansions]
+        if self.kind == "simpleGrading":
+            n = 3
+        elif self.kind == "edgeGrading":
+            n = 12
+        else:
+            raise ValueError(
+                f"Grading '{self.kind}' not supported. Use 'simpleGrading' or 'edgeGrading'."
+            )
+        if len(self.expansions) != n:
+            raise ValueError(f"{self.kind} requires {n} expansions.")
+
+    @classmethod
+    def parse(cls, value):
+        """Create a grading from a string as used in the blockMeshDict.
+
+        Args:
+            value (str or Grading): E.g. "simpleGrading (1 ((0.5 0.5 4) (0.5 0.5 0.25)) 1)"
+
+        Returns:
+            Grading object.
+        """
+        if isinstance(value, Grading):
+            return value
+        tokens = _tokenize(value)
+        if len(tokens) == 0:
+            raise ValueError("Empty grading.")
+        kind = tokens.pop(0)
+        values = _parse_tokens(tokens)
+        if len(values) != 1:
+            raise ValueError(f"Invalid grading '{value}'.")
+        return cls(values[0], kind)
+
+    @classmethod
+    def simple(cls, x1=1, x2=1, x3=1):
+        """simpleGrading with expansions in x1, x2 and x3 direction."""
+        return cls([x1, x2, x3], "simpleGrading")
+
+    @classmethod
+    def edge(cls, *expansions):
+        """edgeGrading with expansions for the edges e0 to e11."""
+        return cls(list(expansions), "edgeGrading")
+
+    def __str__(self):
+        return f"{self.kind} ({' '.join(str(x) for x in self.expansions)})"
+
+    def edge_expansion(self, edge):
+        """Expansion along an edge.
+
+        Args:
+            edge (int): Number of the edge (0 to 11).
+
+        Returns:
+            Expansion object.
+        """
+        if self.kind == "simpleGrading":
+            return self.expansions[edge // 4]
+        return self.expansions[edge]
+
+    def to_edge(self):
+        """Equivalent edgeGrading.
+
+        Returns:
+            Grading object.
+        """
+        return Grading.edge(*[self.edge_expansion(i) for i in range(12)])
+
+    def nodes(self, edge, n):
+        """Relative position of the nodes along an edge, see Expansion.nodes."""
+        return self.edge_expansion(edge).nodes(n)
+
+    def refine(self, cells, cells_refined):
+        """Adapt the grading to refined numbers of cells, see
+        Expansion.refine.
+
+        Args:
+            cells (list): Number of cells in x1, x2, x3 direction.
+            cells_refined (list): Refined number of cells.
+
+        Returns:
+            Grading object.
+        """
+        if self.kind == "simpleGrading":
+            axes = [0, 1, 2]
+        else:
+            axes = [i // 4 for i in range(12)]
+        expansions = [
+            x.refine(cells[axis], cells_refined[axis])
+            for x, axis in zip(self.expansions, axes)
+        ]
+        return Grading(expansions, self.kind)
@@ -0,0 +1,148 @@
+"""Estimation of the mesh quality from the node positions of the blocks,
+without running blockMesh / checkMesh."""
+
+from dataclasses import dataclass
+import numpy as np
+
+# neighbors of the corners of a hexahedron spanning a right-handed system
+_CORNER_NEIGHBORS = [
+    (0, 1, 3, 4),
+    (1, 2, 0, 5),
+    (2, 3, 1, 6),
+    (3, 0, 2, 7),
+    (4, 7, 5, 0),
+    (5, 4, 6, 1),
+    (6, 5, 7, 2),
+    (7, 6, 4, 3),
+]
+
+
+@dataclass
+class Quality:
+    """Mesh quality, with one value per block for the worst cell. The
+    per-cell values are stored in cells (one dict per block) if requested."""
+
+    aspect_ratio: np.ndarray
+    skewness: np.ndarray
+    non_orthogonality: np.ndarray
+    determinant: np.ndarray
+    cells: list = None
+
+
+def _corners(nodes):
+    """Corner points p0 to p7 of the cells of a structured grid."""
+    return [
+        nodes[:-1, :-1, :-1],
+        nodes[1:, :-1, :-1],
+        nodes[1:, 1:, :-1],
+        nodes[:-1, 1:, :-1],
+        nodes[:-1, :-1, 1:],
+        nodes[1:, :-1, 1:],
+        nodes[1:, 1:, 1:],
+        nodes[:-1, 1:, 1:],
+    ]
+
+
+def corner_jacobians(corners):
+    """Scaled Jacobians at the corners of hexahedra, e.g. of the blocks.
+
+    Args:
+        corners (np.array): Points p0 to p7 of shape (n, 8, 3).
+
+    Returns:
+        np.array: Values of shape (n, 8) between -1 and 1, positive for
+        right-handed corners, nan if an edge at the corner has zero length.
+    """
+    corners = np.asarray(corners, dtype=float)
+    neighbors = np.array(_CORNER_NEIGHBORS)
+    x = corners[:, neighbors[:, 1:]] - corners[:, neighbors[:, :1]]
+    scale = np.prod(np.linalg.norm(x, axis=-1), axis=-1)
+    det = np.linalg.det(x)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(scale > 0, det / scale, np.nan)
+
+
+def cell_quality(nodes):
+    """Compute quality measures of the hexahedral cells of a block.
+
+    Args:
+        nodes (np.array): Node positions of shape (n1 + 1, n2 + 1, n3 + 1, 3).
+
+    Returns:
+        dict: Arrays of shape (n1, n2, n3) for aspect_ratio, skewness,
+        non_orthogonality (in degree, between cells in the block) and
+        determinant (minimum scaled Jacobian at the corners, 1 for cuboids).
+    """
+    nodes = np.asarray(nodes, dtype=float)
+    c = _corners(nodes)
+    norm = np.linalg.norm
+
+    # ratio of the largest and smallest mean edge length
+    lengths = np.stack(
+        [
+            sum(norm(c[j] - c[i], axis=-1) for i, j in edges)
+            for edges in [
+                [(0, 1), (3, 2), (7, 6), (4, 5)],
+                [(0, 3), (1, 2), (5, 6), (4, 7)],
+                [(0, 4), (1, 5), (2, 6), (3, 7)],
+            ]
+        ]
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        aspect_ratio = lengths.max(axis=0) / lengths.min(axis=0)
+
+    # scaled Jacobian at the corners, collapsed corners are ignored
+    jacobians = []
+    for corner, a, b, d in _CORNER_NEIGHBORS:
+        x1 = c[a] - c[corner]
+        x2 = c[b] - c[corner]
+        x3 = c[d] - c[corner]
+        scale = norm(x1, axis=-1) * norm(x2, axis=-1) * norm(x3, axis=-1)
+        det = np.einsum("...i,...i", np.cross(x1, x2), x3)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            jacobians.append(np.where(scale > 0, det / scale, np.nan))
+    determinant = np.nan_to_num(np.fmin.reduce(jacobians), nan=0)
+
+    # non-orthogonality and skewness of the faces between the cells
+    centers = sum(c) / 8
+    shape = centers.shape[:3]
+    non_orthogonality = np.zeros(shape)
+    skewness = np.zeros(shape)
+    for axis in range(3):
+        if shape[axis] < 2:
+            continue
+        # face between cell i and i + 1 is the upper face of cell i
+        upper = [slice(None)] * 3
+        upper[axis] = slice(None, -1)
+        upper = tuple(upper)
+        face = {
+            0: [c[1], c[2], c[6], c[5]],
+            1: [c[3], c[2], c[6], c[7]],
+            2: [c[4], c[5], c[6], c[7]],
+        }[axis]
+        face = [x[upper] for x in face]
+        face_center = sum(face) / 4
+        normal = np.cross(face[2] - face[0], face[3] - face[1])
+        owner = centers[upper]
+        lower = [slice(None)] * 3
+        lower[axis] = slice(1, None)
+        lower = tuple(lower)
+        d = centers[lower] - owner
+        nd = np.einsum("...i,...i", normal, d)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cos = np.abs(nd) / (norm(normal, axis=-1) * norm(d, axis=-1))
+            angle = np.degrees(np.arccos(np.clip(np.nan_to_num(cos, nan=1), 0, 1)))
+            t = np.einsum("...i,...i", normal, face_center - owner) / nd
+            intersection = owner + np.nan_to_num(t)[..., None] * d
+            skew = norm(face_center - intersection, axis=-1) / norm(d, axis=-1)
+        skew = np.nan_to_num(skew)
+        for values, face_values in [(non_orthogonality, angle), (skewness, skew)]:
+            values[upper] = np.maximum(values[upper], face_values)
+            values[lower] = np.maximum(values[lower], face_values)
+
+    return {
+        "aspect_ratio": aspect_ratio,
+        "skewness": skewness,
+        "non_orthogonality": non_orthogonality,
+        "determinant": determinant,
+    }
@@ -0,0 +1,335 @@
+"""Command line tool to summarize meshes, either built by a Python script
+using nemoblock or read from a blockMeshDict:
+
+    nemoblock-report script.py
+    nemoblock-report system/blockMeshDict --json
+
+Scripts are executed for real in the current working directory, including
+all their side effects (e.g. the blockMeshDicts they write).
+"""
+import argparse
+import json
+import os
+import re
+import runpy
+import sys
+import time
+from contextlib import contextmanager, redirect_stdout
+
+from .blocks import Block, Mesh, Patch
+from .grading import Grading, _number
+
+
+def _tokenize(text):
+    text = re.sub(r"/\*.*?\*/", " ", text, flags=re.DOTALL)
+    text = re.sub(r"//[^\n]*", " ", text)
+    return re.findall(r'"[^"]*"|[(){};]|[^\s(){};]+', text)
+
+
+def _parse_dict(tokens):
+    """Convert tokens of an OpenFOAM dictionary into a dict."""
+    values = {}
+    while tokens:
+        key = tokens.pop(0)
+        if key == "}":
+            return values
+        if key.startswith("#") or key.startswith("$"):
+            raise ValueError(f"Directive '{key}' is not supported.")
+        if tokens and tokens[0] == "{":
+            tokens.pop(0)
+            values[key] = _parse_dict(tokens)
+            continue
+        entry = []
+        while tokens and tokens[0] != ";":
+            entry.append(_parse_value(tokens))
+        if tokens:
+            tokens.pop(0)
+        values[key] = entry[0] if len(entry) == 1 else entry
+    return values
+
+
+def _parse_value(tokens):
+    token = tokens.pop(0)
+    if token == "(":
+        values = []
+        while tokens[0] != ")":
+            values.append(_parse_value(tokens))
+        tokens.pop(0)
+        return values
+    if token == "{":
+        return _parse_dict(tokens)
+    try:
+        return _number(token)
+    except ValueError:
+        return token.strip('"')
+
+
+def read_block_mesh_dict(filename):
+    """Create a mesh from a blockMeshDict, e.g. to analyze meshes that were
+    not generated with nemoblock.
+
+    Args:
+        filename (str): Path of the blockMeshDict.
+
+    Returns:
+        Mesh object.
+    """
+    with open(filename, "r") as f:
+        data = _parse_dict(_tokenize(f.read()))
+    scale = data.get("scale", data.get("convertToMeters", 1))
+    mesh = Mesh()
+    points = [
+        mesh._add_point(*[scale * _number(x) for x in coords])
+        for coords in data["vertices"]
+    ]
+
+    edges = {}
+    blocks = list(data.get("blocks", []))
+    while blocks:
+        shape = blocks.pop(0)
+        if shape != "hex":
+            raise ValueError(f"Block shape '{shape}' is not supported.")
+        ids = blocks.pop(0)
+        if isinstance(blocks[0], str):  # zone name
+            blocks.pop(0)
+        cells = blocks.pop(0)
+        kind = blocks.pop(0)
+        grading = blocks.pop(0)
+        b = Block(mesh)
+        for k, i in enumerate(ids):
+            setattr(b, f"p{k}", points[i])
+        b.set_number_of_cells(*cells)
+        b.grading = Grading(grading, kind)
+        # share the edges between the blocks
+        for k, (start, end) in enumerate(
+            [(0, 1), (3, 2), (7, 6), (4, 5), (0, 3), (1, 2)]
+            + [(5, 6), (4, 7), (0, 4), (1, 5), (2, 6), (3, 7)]
+        ):
+            key = frozenset([ids[start], ids[end]])
+            if key not in edges:
+                edges[key] = mesh._add_edge(points[ids[start]], points[ids[end]])
+            setattr(b, f"e{k}", edges[key])
+        b.create()
+
+    definitions = list(data.get("edges", []))
+    while definitions:
+        kind = definitions.pop(0)
+        start = definitions.pop(0)
+        end = definitions.pop(0)
+        values = definitions.pop(0)
+        if values == "origin":
+            raise ValueError("Arcs defined by their origin are not supported.")
+        e = edges.get(frozenset([start, end]))
+        if e is None:
+            continue
+        if kind == "arc":
+            values = [values]
+        elif e.p0 is not points[start]:
+            values = values[::-1]
+        e.type = kind
+        e.points = [[scale * x for x in p] for p in values]
+
+    boundary = data.get("boundary", [])
+    patches = [
+        (x["type"], name, x.get("faces", []))
+        for name, x in zip(boundary[::2], boundary[1::2])
+    ]
+    # patches (type name (faces)) as written by nemoblock
+    patches += zip(*[iter(data.get("patches", []))] * 3)
+    for kind, name, faces in patches:
+        p = Patch(mesh, f"{kind} {name}")
+        for face in faces:
+            p.add_face([points[i] for i in face])
+    return mesh
+
+
+@contextmanager
+def _record_writes(records):
+    """Record the meshes written by Mesh.write with the start and end time
+    of writing."""
+    write = Mesh.write
+
+    def recording_write(mesh, directory="./system", refinement=None, propagate=True):
+        start = time.perf_counter()
+        write(mesh, directory, refinement, propagate)
+        records.append((mesh, directory, refinement, start, time.perf_counter()))
+
+    Mesh.write = recording_write
+    try:
+        yield
+    finally:
+        Mesh.write = write
+
+
+def summary(mesh, refinement=None):
+    """Summary of the size, quality and validity of a mesh.
+
+    Args:
+        mesh (Mesh): Mesh to analyze.
+        refinement (float, optional): Refinement factor, see Mesh.write.
+
+    Returns:
+        dict: Sizes and quality are None if the numbers of cells are not
+        defined, quality also for meshes without blocks.
+    """
+    curved = {}
+    for e in {id(e): e for b in mesh.blocks for e in _block_edges(b)}.values():
+        if e.type != "line":
+            curved.setdefault(e.type, {"edges": 0, "points": 0})
+            curved[e.type]["edges"] += 1
+            curved[e.type]["points"] += len(e.points)
+    issues = mesh.validate(raise_error=False)
+    issues += mesh.check_conformity(raise_error=False)
+    undefined = [b.id for b in mesh.blocks if 0 in [b.cells_x1, b.cells_x2, b.cells_x3]]
+    if undefined:
+        issues.append(f"Numbers of cells not defined for blocks {undefined}.")
+    result = {"blocks": len(mesh.blocks)}
+    for key in ["cells", "points", "internal_faces", "boundary_faces"]:
+        result[key] = None
+    result.update(
+        {
+            "patches": {},
+            "unassigned_faces": None,
+            "memory": None,
+            "quality": None,
+            "curved_edges": curved,
+            "issues": issues,
+        }
+    )
+    if undefined:
+        return result
+    statistics = mesh.statistics(refinement=refinement)
+    result.update(
+        {
+            "cells": statistics.cells,
+            "points": statistics.points,
+            "internal_faces": statistics.internal_faces,
+            "boundary_faces": statistics.boundary_faces,
+            "patches": statistics.patches,
+            "unassigned_faces": statistics.default_faces,
+            "memory": statistics.memory,
+        }
+    )
+    if len(mesh.blocks) > 0:
+        quality = mesh.quality()
+        result["quality"] = {
+            "max_aspect_ratio": float(quality.aspect_ratio.max()),
+            "max_skewness": float(quality.skewness.max()),
+            "max_non_orthogonality": float(quality.non_orthogonality.max()),
+            "min_determinant": float(quality.determinant.min()),
+        }
+    return result
+
+
+def _block_edges(b):
+    return [getattr(b, f"e{k}") for k in range(12)]
+
+
+def report(filename):
+    """Build the meshes of a nemoblock script or read a blockMeshDict and
+    summarize them. Scripts are executed in the current working directory
+    with all their side effects.
+
+    Args:
+        filename (str): Python script or blockMeshDict.
+
+    Returns:
+        dict: Summary per mesh (see summary) with timings in seconds. The
+        keys are the output directory (written meshes), the variable name
+        (meshes of scripts that don't write) or the file name, followed by
+        the number of the mesh, e.g. "./system #1". The build time of a
+        written mesh is the time since the previous write. The build time
+        of meshes that are not written is unknown, the time of the whole
+        script is given instead.
+    """
+    meshes = {}
+    if filename.endswith(".py"):
+        records = []
+        argv = sys.argv
+        path = sys.path[:]
+        sys.argv = [filename]
+        # import modules next to the script as with "python script.py"
+        sys.path.insert(0, os.path.dirname(os.path.abspath(filename)))
+        start = time.perf_counter()
+        try:
+            # keep the output of the script apart from the report
+            with _record_writes(records), redirect_stdout(sys.stderr):
+                variables = runpy.run_path(filename, run_name="__main__")
+        finally:
+            sys.argv = argv
+            sys.path[:] = path
+        total = time.perf_counter() - start
+        end = start
+        for k, record in enumerate(records):
+            mesh, directory, refinement, write_start, write_end = record
+            name = f"{directory} #{k + 1}"
+            meshes[name] = summary(mesh, refinement)
+            meshes[name]["timings"] = {
+                "build": write_start - end,
+                "write": write_end - write_start,
+            }
+            end = write_end
+        if not records:  # meshes that were not written
+            unwritten = [x for x in variables.items() if isinstance(x[1], Mesh)]
+            for k, (variable, mesh) in enumerate(unwritten):
+                name = f"{variable} #{k + 1}"
+                meshes[name] = summary(mesh)
+                meshes[name]["timings"] = {"script": total}
+    else:
+        start = time.perf_counter()
+        mesh = read_block_mesh_dict(filename)
+        name = f"{filename} #1"
+        meshes[name] = summary(mesh)
+        meshes[name]["timings"] = {"read": time.perf_counter() - start}
+    return meshes
+
+
+def _print_report(meshes):
+    for name, x in meshes.items():
+        print(f"Mesh {name}")
+        for key in ["blocks", "cells", "points", "internal_faces", "boundary_faces"]:
+            print(f"  {key.replace('_', ' '):<24}{x[key]}")
+        if x["memory"] is not None:
+            print(f"  {'memory (estimate)':<24}{x['memory'] / 1e6:.1f} MB")
+            print("  patches")
+            for patch, faces in x["patches"].items():
+                print(f"    {patch:<22}{faces}")
+            print(f"    {'(unassigned)':<22}{x['unassigned_faces']}")
+        if x["quality"] is not None:
+            print("  quality")
+            for key, value in x["quality"].items():
+                print(f"    {key.replace('_', ' '):<22}{value:.4g}")
+        print("  curved edges")
+        for kind, values in x["curved_edges"].items():
+            print(f"    {kind:<22}{values['edges']} edges, {values['points']} points")
+        print("  timings")
+        for key, value in x["timings"].items():
+            print(f"    {key:<22}{value:.3f} s")
+        if x["issues"]:
+            print("  issues")
+            for issue in x["issues"]:
+                print(f"    {issue}")
+        print()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="nemoblock-report",
+        description="Summarize the meshes built by a nemoblock script or "
+        "defined in a blockMeshDict. Scripts are executed in the current "
+        "working directory, including their side effects.",
+    )
+    parser.add_argument("file", help="Python script or blockMeshDict")
+    parser.add_argument("--json", action="store_true", help="print JSON")
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.file):
+        parser.error(f"File '{args.file}' not found.")
+    meshes = report(args.file)
+    if args.json:
+        print(json.dumps(meshes, indent=2))
+    else:
+        _print_report(meshes)
+
+
+if __name__ == "__main__":
+    main()
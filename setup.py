@@ -15,6 +15,9 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/nemocrys/nemoblock",
     packages=["nemoblock"],
+    entry_points={
+        "console_scripts": ["nemoblock-report=nemoblock.report:main"],
+    },
     # include_package_data=True,
     # package_data={"": ["data/*.yml"]},
     classifiers=[